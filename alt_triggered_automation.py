@@ -20,27 +20,33 @@ python alt_triggered_automation.py [--override-options]
 from __future__ import annotations
 
 import argparse
+import csv
+import itertools
+import os
+import queue
+import sys
 import threading
 import time
 import random
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Tuple
 
 import numpy as np
-from PIL import Image
 import cv2
 
 from pynput import keyboard
 
-from main_glyph_classifier import GlyphClassifier
+from main_glyph_classifier import GlyphClassifier, CSV_FIELDNAMES
 from status_classifier import StatusClassifier
-from window_finder import find_window, get_capture_bbox, ensure_foreground
+from window_finder import find_window, get_capture_bbox, ensure_foreground, refresh_client_bbox
 from keyboard_interface import KeyboardInterface
 import config
 import mss
 
 from telegram_message import send_message
 import asyncio
+import concurrent.futures
 
 class AltTriggeredAutomation:
     def __init__(
@@ -52,11 +58,15 @@ class AltTriggeredAutomation:
         bring_foreground: Optional[bool] = None,
         confidence_threshold: Optional[float] = None,
         esp_delay_range: Optional[Tuple[int, int]] = None,
+        rng_seed: Optional[int] = None,
     ) -> None:
         # Use config values as defaults, allow overrides
         self.title_contains = title_contains or config.WINDOW_TITLE
         self.save_dir = Path(save_dir or config.SCREENSHOTS_DIR)
         self.save_dir.mkdir(parents=True, exist_ok=True)
+        # Plain strings for the per-capture save/CSV paths (no Path joins in the hot path)
+        self._save_dir_str = str(self.save_dir)
+        self._csv_path_str = str(self.save_dir / config.RESULTS_CSV)
 
         # Initialize window finder (don't focus yet - do it after ESP init)
         self.info = find_window(title_contains=self.title_contains)
@@ -70,18 +80,92 @@ class AltTriggeredAutomation:
         self._crop_coords = config.CROP_COORDINATES.copy()
         self._crop_size = config.CROP_SIZE
 
+        # Strip covering all glyph positions, for fused (single grab) capture
+        self._fused_capture = config.FUSED_GLYPH_CAPTURE
+        strip_x = min(x for x, _ in self._crop_coords.values())
+        strip_y = min(y for _, y in self._crop_coords.values())
+        strip_w = max(x for x, _ in self._crop_coords.values()) + self._crop_size - strip_x
+        strip_h = max(y for _, y in self._crop_coords.values()) + self._crop_size - strip_y
+        self._strip_rect = (strip_x, strip_y, strip_w, strip_h)
+        self._strip_slices = {
+            p: (slice(y - strip_y, y - strip_y + self._crop_size), slice(x - strip_x, x - strip_x + self._crop_size))
+            for p, (x, y) in self._crop_coords.items()
+        }
+
         self._lock = threading.Lock()
-        self._total_processed = 0
+        # Saved-crop numbering; next() on itertools.count is atomic, no lock needed
+        self._save_counter = itertools.count(1)
         self._running = True
         self._processing_sequence = False  # Flag to prevent overlapping sequences
         self._stop_monitoring = False  # Flag to immediately stop monitoring loop (S key pressed)
 
-        self._last_alt_press = 0.0
-        self._debounce_s = config.ALT_DEBOUNCE_TIME
+        # All interval timing uses integer nanoseconds from the monotonic perf counter
+        self._last_alt_press_ns = 0
+        self._debounce_ns = int(config.ALT_DEBOUNCE_TIME * 1_000_000_000)
 
-        # MSS instance - will be created per thread due to thread-local storage requirements
+        # MSS instance - will be created per thread due to thread-local storage requirements.
+        # Lookups go through threading.local (no lock); the lock only guards the cleanup list.
+        self._sct_local = threading.local()
         self._sct_lock = threading.Lock()
-        self._sct_instances = {}  # Thread ID -> mss instance mapping
+        self._sct_instances = []  # Every mss instance created, closed at shutdown
+
+        # Optional DXGI capture for full-window grabs (mss remains the fallback)
+        self._dxcam = self._create_dxcam() if config.CAPTURE_BACKEND == "dxcam" else None
+
+        # Console output from the sequence, ESP and listener threads goes through a
+        # writer thread, so a slow console never stalls capture or ESP timing
+        self._log_q = queue.Queue()
+        self._log_thread = threading.Thread(target=self._console_writer_loop, daemon=True)
+        self._log_thread.start()
+
+        # Window geometry and every capture region derived from it are computed once
+        # here and only rebuilt if the window moves or resizes (checked per sequence)
+        try:
+            bbox = get_capture_bbox(self.info)
+        except RuntimeError as e:
+            raise SystemExit(f"Cannot capture window '{self.info.title}': {e}")
+        self._set_capture_geometry(bbox)
+
+        # ESP commands are sent by a dedicated thread so their random delays
+        # overlap with the next capture delay instead of adding to it
+        self._esp_q = queue.Queue()
+        # Deadline of the last scheduled command; each delay counts from it, so
+        # back-to-back results (fused capture) still get a full gap between keys
+        self._last_send_at_ns = 0
+        self._esp_thread = threading.Thread(target=self._esp_sender_loop, daemon=True)
+        self._esp_thread.start()
+
+        # Telegram notifications run on a persistent event loop thread, so a slow
+        # HTTP round-trip never holds up status monitoring or the PM check
+        self._tg_loop = asyncio.new_event_loop()
+        self._tg_thread = threading.Thread(target=self._tg_loop.run_forever, daemon=True)
+        self._tg_thread.start()
+        self._tg_pending = set()
+
+        # Debug image format - BMP (no compression) or low-level PNG keep encoding cheap
+        self._image_ext = config.SAVED_IMAGE_FORMAT
+        if self._image_ext == "jpg":
+            self._imwrite_params = [cv2.IMWRITE_JPEG_QUALITY, config.SAVED_IMAGE_JPEG_QUALITY]
+        elif self._image_ext == "png":
+            self._imwrite_params = [cv2.IMWRITE_PNG_COMPRESSION, config.SAVED_IMAGE_PNG_COMPRESSION]
+        else:
+            self._imwrite_params = []
+
+        # Debug image saves are written by a background thread, off the Alt->ESP path
+        self._io_q = queue.Queue(maxsize=64)
+        self._io_thread = threading.Thread(target=self._image_writer_loop, daemon=True)
+        self._io_thread.start()
+
+        # Results CSV is opened once for the whole run; line buffering still puts
+        # every row on disk as it is written, without an open/close per glyph
+        self._csv_file = None
+        self._csv_writer = None
+        if config.LOG_TO_CSV:
+            csv_exists = os.path.exists(self._csv_path_str)
+            self._csv_file = open(self._csv_path_str, 'a', newline='', buffering=1)
+            self._csv_writer = csv.writer(self._csv_file)
+            if not csv_exists:
+                self._csv_writer.writerow(CSV_FIELDNAMES)
 
         # Timing settings from config
         self._initial_delay = config.INITIAL_DELAY
@@ -92,23 +176,66 @@ class AltTriggeredAutomation:
         self._esp_delay_min, self._esp_delay_max = esp_range
         print(f"ESP random delay range: {self._esp_delay_min}-{self._esp_delay_max}ms")
 
-        # Initialize random seed for ESP delays
-        random.seed()
+        # Normal distribution parameters for ESP delays (99.7% within range)
+        self._esp_delay_mean = (self._esp_delay_min + self._esp_delay_max) / 2
+        self._esp_delay_std = (self._esp_delay_max - self._esp_delay_min) / 6
+
+        # Private RNG for all timing randomness (capture, ESP and status delays).
+        # Seeded from OS entropy unless a seed is given for reproducible runs.
+        self._rng = random.Random(rng_seed)
+        if rng_seed is not None:
+            print(f"Timing RNG seeded with {rng_seed} (deterministic delays)")
+
+        # ESP delays are drawn in vectorized batches (seeded from the timing RNG),
+        # so a keypress only indexes the next precomputed value
+        self._esp_delay_rng = np.random.default_rng(self._rng.getrandbits(64))
+        self._esp_delay_batch = np.empty(0, dtype=np.int64)
+        self._esp_delay_idx = 0
 
         # Initialize glyph classifier
         print(" Initializing template-based glyph classifier...")
         templates_path = templates_path or config.TEMPLATES_PATH
         confidence_threshold = confidence_threshold or config.TEMPLATE_CONFIDENCE_THRESHOLD
         self.classifier = GlyphClassifier(templates_path, confidence_threshold)
+        # Keep lazy first-call work off the first Alt press
+        self.classifier.warmup(self._crop_size)
+
+        # LRU of raw tile bytes -> (prediction, confidence, details); the same
+        # glyph tends to reappear pixel-for-pixel across Alt presses
+        self._tile_cache: OrderedDict = OrderedDict()
+        self._tile_cache_size = config.GLYPH_RESULT_CACHE_SIZE
+
+        # Grayscale conversion target reused for every tile (sequence worker only)
+        self._gray_buf = np.empty((self._crop_size, self._crop_size), dtype=np.uint8)
 
         # Initialize status classifier for alt/wait detection
         print(" Initializing status classifier...")
         self.status_classifier = StatusClassifier()
 
+        # Last (pixels, result) per status region - the wait screen rarely changes between polls
+        self._status_cache = {}
+
+        # PM search template, read once instead of on every PM check
+        pm_template_path = Path(config.STATUS_TEMPLATES_PM) / "pm_1920.png"
+        self._pm_template = cv2.imread(str(pm_template_path), cv2.IMREAD_GRAYSCALE)
+        if self._pm_template is None:
+            print(f"⚠️ PM template not found or unreadable: {pm_template_path} (PM check disabled)")
+
+        # Optional OpenCL offload for the PM search: keep the template resident as a UMat
+        self._pm_template_umat = None
+        if config.PM_MATCH_USE_OPENCL and self._pm_template is not None:
+            if cv2.ocl.haveOpenCL():
+                cv2.ocl.setUseOpenCL(True)
+                self._pm_template_umat = cv2.UMat(self._pm_template)
+                print(" PM template matching uses OpenCL (UMat)")
+            else:
+                print("⚠️ OpenCL not available - PM template matching stays on CPU")
+
         # Initialize ESP32-S3 keyboard interface
         print(" Initializing ESP32-S3 keyboard interface...")
         esp_port = esp_port or config.ESP32_PORT
-        self.keyboard = KeyboardInterface(esp_port or "")
+        # Key-press output is queued to the console writer, never printed on the ESP sender thread
+        self.keyboard = KeyboardInterface(esp_port or "", log=self._log)
         if not self.keyboard.initialize():
             raise SystemExit(" Failed to initialize ESP32-S3 keyboard interface")
 
@@ -117,447 +244,694 @@ class AltTriggeredAutomation:
             print(" Bringing window to foreground...")
             ensure_foreground(self.info.hwnd)
 
+        # Single long-lived worker runs the sequences (one mss instance, no thread per Alt press)
+        self._sequence_event = threading.Event()
+        self._sequence_thread = threading.Thread(target=self._sequence_worker_loop, daemon=True)
+        self._sequence_thread.start()
+
         print(" Alt-triggered automation ready!")
 
     def _now_ms(self) -> int:
-        return int(time.time() * 1000)
+        """Wall-clock epoch milliseconds, used only for file names"""
+        return time.time_ns() // 1_000_000
+
+    def _log(self, message: str = "") -> None:
+        """Queue a console line for the writer thread"""
+        self._log_q.put(message)
+
+    def _console_writer_loop(self) -> None:
+        """Print queued console lines until the None sentinel arrives"""
+        while True:
+            message = self._log_q.get()
+            if message is None:
+                return
+            print(message)
+
+    def _stop_console_writer(self) -> None:
+        """Flush pending console lines and stop the writer thread"""
+        self._log_q.put(None)
+        self._log_thread.join(timeout=5.0)
+
+    def _send_telegram(self, message: str, label: str) -> None:
+        """Queue a Telegram message on the notification loop and return immediately"""
+        future = asyncio.run_coroutine_threadsafe(send_message(message), self._tg_loop)
+        self._tg_pending.add(future)
+
+        def _done(f: concurrent.futures.Future) -> None:
+            self._tg_pending.discard(f)
+            try:
+                if f.result():
+                    self._log(f"    Telegram message sent: {label}")
+            except Exception as telegram_error:
+                self._log(f"    Failed to send Telegram message: {telegram_error}")
+
+        future.add_done_callback(_done)
+
+    def _stop_telegram(self) -> None:
+        """Give pending Telegram messages a moment to finish, then stop the loop thread"""
+        concurrent.futures.wait(list(self._tg_pending), timeout=5.0)
+        self._tg_loop.call_soon_threadsafe(self._tg_loop.stop)
+        self._tg_thread.join(timeout=5.0)
 
     def _get_random_esp_delay(self) -> int:
         """Generate random delay using normal distribution for more human-like timing"""
-        # Use normal distribution instead of uniform for more realistic human-like delays
-        mean = (self._esp_delay_min + self._esp_delay_max) / 2
-        std_dev = (self._esp_delay_max - self._esp_delay_min) / 6  # 99.7% within range
-
-        delay = int(random.gauss(mean, std_dev))
-        # Clamp to min/max range
-        return max(self._esp_delay_min, min(self._esp_delay_max, delay))
+        if self._esp_delay_idx >= len(self._esp_delay_batch):
+            self._refill_esp_delays()
+        delay = self._esp_delay_batch[self._esp_delay_idx]
+        self._esp_delay_idx += 1
+        return int(delay)
+
+    def _refill_esp_delays(self, count: int = 1024) -> None:
+        """Draw a fresh batch of clamped normal-distributed ESP delays (ms)"""
+        # Use normal distribution instead of uniform for more realistic human-like delays;
+        # truncate like int() and clamp to the min/max range
+        samples = self._esp_delay_rng.normal(self._esp_delay_mean, self._esp_delay_std, count)
+        self._esp_delay_batch = np.clip(samples.astype(np.int64), self._esp_delay_min, self._esp_delay_max)
+        self._esp_delay_idx = 0
 
     def _get_thread_mss(self):
         """Get or create mss instance for current thread"""
-        thread_id = threading.get_ident()
+        sct = getattr(self._sct_local, "sct", None)
+        if sct is None:
+            sct = self._sct_local.sct = mss.mss()
+            with self._sct_lock:
+                self._sct_instances.append(sct)
+        return sct
 
-        with self._sct_lock:
-            if thread_id not in self._sct_instances:
-                self._sct_instances[thread_id] = mss.mss()
+    def _image_writer_loop(self) -> None:
+        """Write queued debug images to disk until a None sentinel is received"""
+        while True:
+            item = self._io_q.get()
+            try:
+                if item is None:
+                    return
+                path, image = item
+                cv2.imwrite(path, image, self._imwrite_params)
+            except Exception as e:
+                self._log(f"⚠️ Failed to save image: {e}")
+            finally:
+                self._io_q.task_done()
 
-        return self._sct_instances[thread_id]
+    def _queue_image_save(self, path: str, image: np.ndarray) -> None:
+        """Hand a BGRA capture to the writer thread as a BGR copy (caller may reuse its buffer)"""
+        try:
+            # mss leaves alpha undefined (often 0), so it must not end up in the saved file
+            self._io_q.put_nowait((path, image[..., :3].copy()))
+        except queue.Full:
+            self._log(f"⚠️ Image save queue full, dropping {os.path.basename(path)}")
+
+    def _stop_image_writer(self) -> None:
+        """Flush pending image saves and stop the writer thread"""
+        self._io_q.put(None)
+        self._io_thread.join(timeout=5.0)
+
+    def _set_capture_geometry(self, bbox: Tuple[int, int, int, int]) -> None:
+        """Build the window monitor dict and all derived crop slices / grab regions for bbox"""
+        self._bbox = bbox
+        self._monitor = {
+            "left": bbox[0],
+            "top": bbox[1],
+            "width": bbox[2],
+            "height": bbox[3]
+        }
+
+        self._dxcam_region = (
+            self._monitor["left"],
+            self._monitor["top"],
+            self._monitor["left"] + self._monitor["width"],
+            self._monitor["top"] + self._monitor["height"]
+        )
+        self._dxcam_last_frame: Optional[np.ndarray] = None
+
+        # Crop regions validated against the window size, as ready-made slices
+        self._crop_slices = {
+            "status": self._region_slices("Status", **config.STATUS_REGION_CROP),
+            "end": self._region_slices("End", **config.END_REGION_CROP),
+            "pm": self._region_slices("PM", **config.PM_REGION_CROP),
+        }
+        # ...and as screen-space monitor dicts, so mss grabs only the region itself
+        self._region_monitors = {region: self._slices_monitor(sl) for region, sl in self._crop_slices.items()}
+
+        # Per-position glyph grab regions, resolved to screen coordinates up front
+        self._tile_monitors = {
+            p: self._region_monitor(f"Position {p}", x, y, self._crop_size, self._crop_size)
+            for p, (x, y) in self._crop_coords.items()
+        }
+        self._strip_monitor = self._region_monitor("Glyph strip", *self._strip_rect)
+
+    def _refresh_capture_geometry(self) -> None:
+        """Re-read the window client area and rebuild capture regions only if it changed"""
+        # find_window() only snapshots the client rect, so query the live one
+        refresh_client_bbox(self.info)
+        try:
+            bbox = get_capture_bbox(self.info)
+        except RuntimeError as e:
+            self._log(f"⚠️ Cannot read window geometry, keeping previous capture regions: {e}")
+            return
+        if bbox != self._bbox:
+            self._log(f" Window moved/resized {self._bbox} -> {bbox}, updating capture regions")
+            self._set_capture_geometry(bbox)
+
+    def _create_dxcam(self):
+        """Create a DXGI desktop duplication camera, or None to stay on mss"""
+        try:
+            import dxcam
+        except ImportError:
+            print("⚠️ dxcam not installed (pip install dxcam) - using mss capture")
+            return None
+        try:
+            camera = dxcam.create(output_color="BGRA")
+        except Exception as e:
+            print(f"⚠️ dxcam initialization failed ({e}) - using mss capture")
+            return None
+        if camera is None:
+            print("⚠️ dxcam unavailable on this output - using mss capture")
+            return None
+        print(" Using dxcam (DXGI) for full-window capture")
+        return camera
+
+    @staticmethod
+    def _bgra_view(screenshot) -> np.ndarray:
+        """Zero-copy (height, width, 4) BGRA view of an mss screenshot's raw buffer"""
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
 
     def _safe_grab(self) -> Optional[np.ndarray]:
-        """Capture screenshot of MTA window using thread-local mss instance"""
+        """Capture screenshot of MTA window (dxcam if enabled, else thread-local mss instance)"""
+        if self._dxcam is not None:
+            try:
+                # dxcam returns None when the screen hasn't changed since the last grab
+                frame = self._dxcam.grab(region=self._dxcam_region)
+                if frame is not None:
+                    self._dxcam_last_frame = frame
+                if self._dxcam_last_frame is not None:
+                    return self._dxcam_last_frame
+            except Exception as e:
+                self._log(f"⚠️ dxcam capture failed, using mss: {e}")
+
         try:
-            if self.info is None:
-                print("⚠️ Window info is None, cannot capture screen.")
-                return None
-            bbox = get_capture_bbox(self.info)
-            monitor = {
-                "left": bbox[0],
-                "top": bbox[1],
-                "width": bbox[2],
-                "height": bbox[3]
-            }
             # Get thread-local mss instance
             sct = self._get_thread_mss()
-            screenshot = sct.grab(monitor)
-            frame = np.asarray(screenshot, dtype=np.uint8)[..., :3]
-            return frame
+            screenshot = sct.grab(self._monitor)
+            return self._bgra_view(screenshot)
         except Exception as e:
-            print(f"⚠️ Capture failed: {e}")
+            self._log(f"⚠️ Capture failed: {e}")
             return None
 
-    def _crop_frame(self, frame: np.ndarray, position: int) -> Optional[np.ndarray]:
-        """Crop frame to specified size at position coordinates from config"""
-        if position not in self._crop_coords:
+    def _grab_tile(self, position: int) -> Optional[np.ndarray]:
+        """Capture only the glyph tile at position coordinates from config (no full-window grab)"""
+        monitor = self._tile_monitors.get(position)
+        if monitor is None:
             return None
-        x, y = self._crop_coords[position]
-        size = self._crop_size
 
-        if (y + size > frame.shape[0]) or (x + size > frame.shape[1]):
-            print(f"⚠️ Crop coordinates ({x}, {y}) + {size}x{size} exceed frame bounds {frame.shape}")
+        try:
+            screenshot = self._get_thread_mss().grab(monitor)
+            return self._bgra_view(screenshot)
+        except Exception as e:
+            self._log(f"⚠️ Tile capture failed: {e}")
             return None
 
-        cropped = frame[y:y+size, x:x+size]
-        return cropped
-
-    def _crop_status_region(self, frame: np.ndarray) -> Optional[np.ndarray]:
-        """Crop frame to status region for alt/wait detection"""
-        x = config.STATUS_REGION_CROP['x']
-        y = config.STATUS_REGION_CROP['y']
-        width = config.STATUS_REGION_CROP['width']
-        height = config.STATUS_REGION_CROP['height']
+    def _grab_strip(self) -> Optional[np.ndarray]:
+        """Capture one strip covering every glyph position (fused capture)"""
+        if self._strip_monitor is None:
+            return None
 
-        if (y + height > frame.shape[0]) or (x + width > frame.shape[1]):
-            print(f" Status crop coordinates ({x}, {y}) + {width}x{height} exceed frame bounds {frame.shape}")
+        try:
+            screenshot = self._get_thread_mss().grab(self._strip_monitor)
+            return self._bgra_view(screenshot)
+        except Exception as e:
+            self._log(f"⚠️ Strip capture failed: {e}")
             return None
 
-        cropped = frame[y:y+height, x:x+width]
-        return cropped
+    def _region_monitor(self, name: str, x: int, y: int, width: int, height: int) -> Optional[dict]:
+        """Validate a window-relative region once and return its screen-space mss monitor dict"""
+        return self._slices_monitor(self._region_slices(name, x, y, width, height))
 
-    def _crop_end_region(self, frame: np.ndarray) -> Optional[np.ndarray]:
-        """Crop frame to end region for end detection"""
-        x = config.END_REGION_CROP['x']
-        y = config.END_REGION_CROP['y']
-        width = config.END_REGION_CROP['width']
-        height = config.END_REGION_CROP['height']
+    def _slices_monitor(self, slices: Optional[Tuple[slice, slice]]) -> Optional[dict]:
+        """Screen-space mss monitor dict for window-relative (rows, cols) slices; None passes through"""
+        if slices is None:
+            return None
+        rows, cols = slices
+        return {
+            "left": self._monitor["left"] + cols.start,
+            "top": self._monitor["top"] + rows.start,
+            "width": cols.stop - cols.start,
+            "height": rows.stop - rows.start
+        }
+
+    def _grab_region(self, region: str) -> Optional[np.ndarray]:
+        """Capture a status region ('status', 'end' or 'pm') directly; None if it can't be captured"""
+        if self._dxcam is not None:
+            # DXGI duplicates the whole output anyway - grab the window and crop
+            frame = self._safe_grab()
+            return None if frame is None else self._crop_region(frame, region)
 
-        if (y + height > frame.shape[0]) or (x + width > frame.shape[1]):
-            print(f" End crop coordinates ({x}, {y}) + {width}x{height} exceed frame bounds {frame.shape}")
+        monitor = self._region_monitors[region]
+        if monitor is None:
             return None
 
-        cropped = frame[y:y+height, x:x+width]
-        return cropped
+        try:
+            screenshot = self._get_thread_mss().grab(monitor)
+            return self._bgra_view(screenshot)
+        except Exception as e:
+            self._log(f"⚠️ {region.capitalize()} region capture failed: {e}")
+            return None
 
-    def _crop_pm_region(self, frame: np.ndarray) -> Optional[np.ndarray]:
-        """Crop frame to PM region for PM detection"""
-        x = config.PM_REGION_CROP['x']
-        y = config.PM_REGION_CROP['y']
-        width = config.PM_REGION_CROP['width']
-        height = config.PM_REGION_CROP['height']
+    def _region_slices(self, name: str, x: int, y: int, width: int, height: int) -> Optional[Tuple[slice, slice]]:
+        """Validate a crop region against the window size once and return its (rows, cols) slices"""
+        if (y + height > self._monitor["height"]) or (x + width > self._monitor["width"]):
+            self._log(f" {name} crop coordinates ({x}, {y}) + {width}x{height} exceed window bounds "
+                      f"{self._monitor['width']}x{self._monitor['height']}")
+            return None
+        return slice(y, y + height), slice(x, x + width)
 
-        if (y + height > frame.shape[0]) or (x + width > frame.shape[1]):
-            print(f" PM crop coordinates ({x}, {y}) + {width}x{height} exceed frame bounds {frame.shape}")
+    def _crop_region(self, frame: np.ndarray, region: str) -> Optional[np.ndarray]:
+        """Crop frame to a precomputed region ('status', 'end' or 'pm'); None if it doesn't fit"""
+        slices = self._crop_slices[region]
+        if slices is None:
             return None
+        return frame[slices]
 
-        cropped = frame[y:y+height, x:x+width]
-        return cropped
+    def _process_classification(self, prediction: str, confidence: float, position: int) -> str:
+        """Schedule the ESP command for a classification result after a random delay.
 
-    def _process_classification(self, prediction: str, confidence: float, position: int) -> bool:
-        """Process classification result and send appropriate ESP commands with random delay"""
+        The command is queued for the ESP sender thread, so the random delay runs in
+        parallel with the next capture delay instead of blocking the sequence. The
+        delay counts from the later of now and the previous command's send time, so
+        consecutive key presses are always at least one random delay apart.
+        Returns a short outcome note for the caller's per-position log line.
+        """
 
         if confidence < config.MIN_CONFIDENCE_FOR_ESP_ACTION:
-            print(f"    Confidence too low ({confidence:.3f}) - no ESP action")
-            return False
+            return "confidence too low - no ESP action"
+
+        if prediction not in ('q', 'e'):
+            return f"unknown prediction '{prediction}' - no ESP action"
 
         # Generate random delay before ESP command
         esp_delay = self._get_random_esp_delay()
-        print(f"    Random ESP delay: {esp_delay}ms")
-        time.sleep(esp_delay / 1000.0)  # Convert to seconds
-
-        # Send appropriate key command to ESP32-S3
-        esp_success = False
+        send_at_ns = max(time.perf_counter_ns(), self._last_send_at_ns) + esp_delay * 1_000_000  # ms -> ns
+        self._last_send_at_ns = send_at_ns
+        self._esp_q.put((prediction, confidence, send_at_ns))
+        return f"{prediction.upper()} to ESP in {esp_delay}ms"
 
+    def _send_esp_command(self, prediction: str, confidence: float) -> bool:
+        """Send the key command for a detected glyph to the ESP32-S3"""
         if prediction == 'q':
-            print(f"    Detected Q glyph (conf: {confidence:.3f}) -> sending Q to ESP32")
             esp_success = self.keyboard.press_q()
-        elif prediction == 'e':
-            print(f"    Detected E glyph (conf: {confidence:.3f}) -> sending E to ESP32") 
-            esp_success = self.keyboard.press_e()
         else:
-            print(f"    Unknown prediction: {prediction}")
-            return False
+            esp_success = self.keyboard.press_e()
 
         if esp_success:
-            print(f"    Successfully sent {prediction.upper()} to ESP32-S3")
+            self._log(f"    Sent {prediction.upper()} to ESP32-S3 (conf: {confidence:.3f})")
         else:
-            print(f"    Failed to send {prediction.upper()} to ESP32-S3")
+            self._log(f"    Failed to send {prediction.upper()} to ESP32-S3")
 
         return esp_success
 
+    def _esp_sender_loop(self) -> None:
+        """Send queued ESP commands in order, each at its scheduled time"""
+        while True:
+            item = self._esp_q.get()
+            try:
+                if item is None:
+                    return
+                prediction, confidence, send_at_ns = item
+                remaining_ns = send_at_ns - time.perf_counter_ns()
+                if remaining_ns > 0:
+                    time.sleep(remaining_ns / 1_000_000_000)
+                # After ESC, commands still queued are drained without pressing keys
+                if not self._running:
+                    continue
+                self._send_esp_command(prediction, confidence)
+            except Exception as e:
+                self._log(f"    ESP send error: {e}")
+            finally:
+                self._esp_q.task_done()
+
+    def _wait_for_esp_commands(self) -> None:
+        """Block until every scheduled ESP command has been sent"""
+        self._esp_q.join()
+
     def _capture_classify_and_send(self, position: int) -> bool:
         """Capture, classify and send ESP command for a specific position"""
 
         # Apply position-specific random delay from range
         if position <= len(self._capture_delays):
             delay_min, delay_max = self._capture_delays[position-1]
-            random_delay = random.uniform(delay_min, delay_max)
-            print(f"    Capture delay for position {position}: {random_delay:.3f}s")
+            random_delay = self._rng.uniform(delay_min, delay_max)
+            self._log(f"    Capture delay for position {position}: {random_delay:.3f}s")
             time.sleep(random_delay)
 
-        # Capture screenshot
-        frame = self._safe_grab()
-        if frame is None:
-            print(f"    Failed to capture frame for position {position}")
-            return False
+        # The previous glyph's key must be out before its successor is captured
+        self._wait_for_esp_commands()
 
-        # Crop to glyph area
-        cropped = self._crop_frame(frame, position)
+        # Capture just the glyph area
+        cropped = self._grab_tile(position)
         if cropped is None:
-            print(f"    Failed to crop frame for position {position}")
+            self._log(f"    Failed to capture glyph tile for position {position}")
             return False
 
-        # Save cropped image if enabled
+        return self._classify_and_send(position, cropped)
+
+    def _classify_tiles(self, tiles: list) -> list:
+        """Classify several glyph tiles with one batched template match.
+
+        Tiles that the glyph result cache already knows are skipped (None in the
+        returned list); _classify_and_send serves those from the cache.
+        """
+        results = [None] * len(tiles)
+        misses = [i for i, tile in enumerate(tiles)
+                  if not self._tile_cache_size or tile.tobytes() not in self._tile_cache]
+        if misses:
+            grays = [cv2.cvtColor(tiles[i], cv2.COLOR_BGRA2GRAY) for i in misses]
+            for i, result in zip(misses, self.classifier.classify_batch(grays)):
+                results[i] = result
+        return results
+
+    def _classify_and_send(self, position: int, cropped: np.ndarray,
+                           classified: Optional[Tuple[str, float, dict]] = None) -> bool:
+        """Classify an already captured glyph tile and send the ESP command
+
+        classified: result already computed for this tile by _classify_tiles
+        """
+
+        # Pixel-identical tile seen before - reuse its result, skip classify and image save
+        key = cropped.tobytes() if self._tile_cache_size else None
+        cached = self._tile_cache.get(key) if key is not None else None
+        if cached is not None:
+            self._tile_cache.move_to_end(key)
+            prediction, confidence, details = cached
+            outcome = self._process_classification(prediction, confidence, position)
+            self._log(f"    Position {position}: {prediction} (conf: {confidence:.3f}) -> cached | {outcome}")
+            # Still one CSV row per position; no crop was saved, so the path is "cached"
+            if self._csv_writer is not None:
+                self._csv_writer.writerow(self.classifier.csv_row("cached", prediction, confidence, details))
+            return True
+
+        if classified is not None:
+            prediction, confidence, details = classified
+        else:
+            # Classify the glyph straight from the grayscale array (no PIL round-trip)
+            gray = cv2.cvtColor(cropped, cv2.COLOR_BGRA2GRAY, dst=self._gray_buf)
+            prediction, confidence, details = self.classifier.classify(gray)
+
+        if key is not None:
+            self._tile_cache[key] = (prediction, confidence, details)
+            if len(self._tile_cache) > self._tile_cache_size:
+                self._tile_cache.popitem(last=False)
+
+        # Schedule ESP32-S3 command if confident enough (with random delay)
+        outcome = self._process_classification(prediction, confidence, position)
+
+        # Save cropped image if enabled - after the ESP command is scheduled, so the
+        # copy for the writer thread and the CSV append are off the critical path
         if config.SAVE_CROPPED_IMAGES:
             ts = self._now_ms()
-            with self._lock:
-                self._total_processed += 1
-                total_idx = self._total_processed
+            total_idx = next(self._save_counter)
 
-            fname = f"pos{position}_alt_seq_{ts}_{total_idx:04d}.png"
-            path = self.save_dir / fname
-            cv2.imwrite(str(path), cropped)
+            fname = f"pos{position}_alt_seq_{ts}_{total_idx:04d}.{self._image_ext}"
+            path = os.path.join(self._save_dir_str, fname)
+            self._queue_image_save(path, cropped)
         else:
             fname = "not_saved"
             path = f"pos{position}_temp"
 
-        # Convert to PIL for classification
-        pil_img = Image.fromarray(cv2.cvtColor(cropped, cv2.COLOR_BGR2GRAY))
-
-        # Classify the glyph
-        prediction, confidence, details = self.classifier.classify(pil_img)
-
-        print(f"    Position {position}: {prediction} (conf: {confidence:.3f}) -> {fname if config.SAVE_CROPPED_IMAGES else 'not saved'}")
-
-        # Send to ESP32-S3 if confident enough (with random delay)
-        esp_sent = self._process_classification(prediction, confidence, position)
+        # One log line per position
+        self._log(f"    Position {position}: {prediction} (conf: {confidence:.3f}) -> {fname if config.SAVE_CROPPED_IMAGES else 'not saved'} | {outcome}")
 
         # Log to CSV if enabled
-        if config.LOG_TO_CSV:
-            csv_path = self.save_dir / config.RESULTS_CSV
-            self.classifier.log_result(str(path), prediction, confidence, details, 
-                                     csv_path=str(csv_path))
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(self.classifier.csv_row(path, prediction, confidence, details))
 
         return True
 
+    def _classify_status(self, gray: np.ndarray, region_type: str) -> Tuple[str, float, dict]:
+        """Classify a status/end crop, reusing the last result while the region is pixel-identical"""
+        key = gray.tobytes()
+        cached = self._status_cache.get(region_type)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = self.status_classifier.classify(gray, region_type=region_type)
+        self._status_cache[region_type] = (key, result)
+        return result
+
     def _status_monitoring_loop(self):
         """Monitor status region for alt/wait detection after Q/E sequence"""
-        print(f"\n Starting status monitoring loop...")
-        print(f"   ⏱️ Initial wait: {config.STATUS_INITIAL_WAIT}s")
-        time.sleep(config.STATUS_INITIAL_WAIT)
+        # Each Alt auto-trigger starts a fresh monitoring round in this loop (no recursion)
+        while True:
+            self._log(f"\n Starting status monitoring loop...")
+            self._log(f"   ⏱️ Initial wait: {config.STATUS_INITIAL_WAIT}s")
+            time.sleep(config.STATUS_INITIAL_WAIT)
+
+            no_match_count = 0
+            iteration_count = 0
+            exit_reason = ""  # Track why we're exiting
+            restart = False  # Set when an automated Alt ran a new Q/E sequence
+
+            while iteration_count < config.STATUS_MAX_ITERATIONS and self._running and not self._stop_monitoring:
+                # Random delay between checks
+                delay = self._rng.uniform(config.STATUS_CHECK_DELAY_MIN, config.STATUS_CHECK_DELAY_MAX)
+                time.sleep(delay)
+
+                # FIRST: Check for 'end' status (takes priority)
+                end_cropped = self._grab_region("end")
+                if end_cropped is not None:
+                    try:
+                        end_gray = cv2.cvtColor(end_cropped, cv2.COLOR_BGRA2GRAY)
+                        end_prediction, end_confidence, end_details = self._classify_status(end_gray, "end")
 
-        no_match_count = 0
-        iteration_count = 0
-        exit_reason = ""  # Track why we're exiting
+                        iteration_count += 1
+                        self._log(f"    Iteration {iteration_count}: Checking END - {end_prediction} (conf: {end_confidence:.3f})")
 
-        while iteration_count < config.STATUS_MAX_ITERATIONS and self._running and not self._stop_monitoring:
-            # Random delay between checks
-            delay = random.uniform(config.STATUS_CHECK_DELAY_MIN, config.STATUS_CHECK_DELAY_MAX)
-            time.sleep(delay)
+                        end_threshold = config.STATUS_CONFIDENCE_THRESHOLDS.get('end', config.STATUS_CONFIDENCE_THRESHOLD)
+                        if end_prediction == "end" and end_confidence >= end_threshold:
+                            self._log(f"    END detected! Exiting to idle state...")
 
-            # Capture screenshot
-            frame = self._safe_grab()
-            if frame is None:
-                print(f"    Failed to capture frame in status monitoring")
-                no_match_count += 1
-                if no_match_count >= config.STATUS_MAX_RETRIES:
-                    print(f"    Too many capture failures, exiting monitoring loop")
-                    exit_reason = f"Too many capture failures ({config.STATUS_MAX_RETRIES} retries)"
-                    break
-                continue
+                            # Send telegram message
+                            message = f"END detected! Confidence: {end_confidence:.3f}\nExiting to idle state."
+                            self._send_telegram(message, "END detected")
 
-            # FIRST: Check for 'end' status (takes priority)
-            end_cropped = self._crop_end_region(frame)
-            if end_cropped is not None:
-                try:
-                    pil_end_img = Image.fromarray(cv2.cvtColor(end_cropped, cv2.COLOR_BGR2GRAY))
-                    end_prediction, end_confidence, end_details = self.status_classifier.classify(pil_end_img, region_type="end")
+                            break  # Exit monitoring loop, return to idle
 
-                    iteration_count += 1
-                    print(f"    Iteration {iteration_count}: Checking END - {end_prediction} (conf: {end_confidence:.3f})")
+                    except Exception as e:
+                        self._log(f"    End classification error: {e}")
 
-                    end_threshold = config.STATUS_CONFIDENCE_THRESHOLDS.get('end', config.STATUS_CONFIDENCE_THRESHOLD)
-                    if end_prediction == "end" and end_confidence >= end_threshold:
-                        print(f"    END detected! Exiting to idle state...")
+                # SECOND: Check for 'alt' or 'wait' status
+                cropped = self._grab_region("status")
+                if cropped is None:
+                    self._log(f"    Failed to capture status region")
+                    no_match_count += 1
+                    if no_match_count >= config.STATUS_MAX_RETRIES:
+                        self._log(f"    Too many capture failures, exiting monitoring loop")
+                        exit_reason = f"Too many capture failures ({config.STATUS_MAX_RETRIES} retries)"
+                        break
+                    continue
 
-                        # Send telegram message
-                        try:
-                            message = f"END detected! Confidence: {end_confidence:.3f}\nExiting to idle state."
-                            asyncio.run(send_message(message))
-                            print(f"    Telegram message sent: END detected")
-                        except Exception as telegram_error:
-                            print(f"    Failed to send Telegram message: {telegram_error}")
+                # Classify straight from the grayscale array (no PIL round-trip)
+                gray = cv2.cvtColor(cropped, cv2.COLOR_BGRA2GRAY)
 
-                        break  # Exit monitoring loop, return to idle
+                # Classify status region
+                try:
+                    prediction, confidence, details = self._classify_status(gray, "status")
 
-                except Exception as e:
-                    print(f"    End classification error: {e}")
-
-            # SECOND: Check for 'alt' or 'wait' status
-            cropped = self._crop_status_region(frame)
-            if cropped is None:
-                print(f"    Failed to crop status region")
-                no_match_count += 1
-                if no_match_count >= config.STATUS_MAX_RETRIES:
-                    print(f"    Too many crop failures, exiting monitoring loop")
-                    exit_reason = f"Too many crop failures ({config.STATUS_MAX_RETRIES} retries)"
-                    break
-                continue
+                    self._log(f"    Status check: {prediction} (conf: {confidence:.3f})")
 
-            # Convert to PIL for classification
-            pil_img = Image.fromarray(cv2.cvtColor(cropped, cv2.COLOR_BGR2GRAY))
+                    # Get threshold for the specific status type
+                    status_threshold = config.STATUS_CONFIDENCE_THRESHOLDS.get(prediction, config.STATUS_CONFIDENCE_THRESHOLD)
 
-            # Classify status region
-            try:
-                prediction, confidence, details = self.status_classifier.classify(pil_img, region_type="status")
+                    # Check if confident match
+                    if confidence >= status_threshold:
+                        no_match_count = 0  # Reset retry counter
 
-                print(f"    Status check: {prediction} (conf: {confidence:.3f})")
+                        if prediction == "wait":
+                            # Keep waiting
+                            self._log(f"    Status: WAIT - continuing monitoring...")
+                            continue
 
-                # Get threshold for the specific status type
-                status_threshold = config.STATUS_CONFIDENCE_THRESHOLDS.get(prediction, config.STATUS_CONFIDENCE_THRESHOLD)
+                        elif prediction == "alt":
+                            # Trigger Alt and restart Q/E sequence
+                            self._log(f"    Status: ALT detected - triggering automated Alt press!")
 
-                # Check if confident match
-                if confidence >= status_threshold:
-                    no_match_count = 0  # Reset retry counter
+                            # Send Alt to ESP32
+                            if self.keyboard.press_alt():
+                                self._log(f"    Alt signal sent to ESP32")
+                            else:
+                                self._log(f"    Failed to send Alt to ESP32")
 
-                    if prediction == "wait":
-                        # Keep waiting
-                        print(f"    Status: WAIT - continuing monitoring...")
-                        continue
+                            # Execute Q/E sequence
+                            self._execute_qe_sequence()
 
-                    elif prediction == "alt":
-                        # Trigger Alt and restart Q/E sequence
-                        print(f"    Status: ALT detected - triggering automated Alt press!")
+                            # ESC during the automated Q/E sequence - skip the PM check
+                            if not self._running:
+                                return
 
-                        # Send Alt to ESP32
-                        if self.keyboard.press_alt():
-                            print(f"    Alt signal sent to ESP32")
-                        else:
-                            print(f"    Failed to send Alt to ESP32")
+                            # Check for PM status after Q/E sequence
+                            pm_detected = self._check_pm_status()
 
-                        # Execute Q/E sequence
-                        self._execute_qe_sequence()
+                            # Only proceed to status monitoring if no PM detected
+                            if pm_detected:
+                                self._log(f"    PM detected after automated Alt - returning to idle")
+                                return
 
-                        # Check for PM status after Q/E sequence
-                        pm_detected = self._check_pm_status()
+                            # After sequence, start a fresh monitoring round
+                            self._log(f"    Restarting status monitoring after Q/E sequence...")
+                            restart = True
+                            break
 
-                        # Only proceed to status monitoring if no PM detected
-                        if not pm_detected:
-                            # After sequence, restart monitoring (recursive call)
-                            print(f"    Restarting status monitoring after Q/E sequence...")
-                            self._status_monitoring_loop()
-                        else:
-                            print(f"    PM detected after automated Alt - returning to idle")
+                    else:
+                        # Low confidence - no clear match
+                        no_match_count += 1
+                        self._log(f"    Low confidence ({confidence:.3f}) - no match count: {no_match_count}/{config.STATUS_MAX_RETRIES}")
 
-                        return  # Exit this loop instance
+                        if no_match_count >= config.STATUS_MAX_RETRIES:
+                            self._log(f"    Max retries reached, exiting monitoring loop")
+                            exit_reason = f"Max retries reached - low confidence matches ({config.STATUS_MAX_RETRIES} retries)"
+                            break
 
-                else:
-                    # Low confidence - no clear match
+                except Exception as e:
+                    self._log(f"    Status classification error: {e}")
                     no_match_count += 1
-                    print(f"    Low confidence ({confidence:.3f}) - no match count: {no_match_count}/{config.STATUS_MAX_RETRIES}")
-
                     if no_match_count >= config.STATUS_MAX_RETRIES:
-                        print(f"    Max retries reached, exiting monitoring loop")
-                        exit_reason = f"Max retries reached - low confidence matches ({config.STATUS_MAX_RETRIES} retries)"
+                        self._log(f"    Too many errors, exiting monitoring loop")
+                        exit_reason = f"Too many classification errors ({config.STATUS_MAX_RETRIES} retries)"
                         break
 
-            except Exception as e:
-                print(f"    Status classification error: {e}")
-                no_match_count += 1
-                if no_match_count >= config.STATUS_MAX_RETRIES:
-                    print(f"    Too many errors, exiting monitoring loop")
-                    exit_reason = f"Too many classification errors ({config.STATUS_MAX_RETRIES} retries)"
-                    break
+            if not restart:
+                break
 
         # Exit monitoring loop - set reason if not already set
         if not exit_reason and iteration_count >= config.STATUS_MAX_ITERATIONS:
-            print(f"    Max iterations ({config.STATUS_MAX_ITERATIONS}) reached, exiting monitoring")
+            self._log(f"    Max iterations ({config.STATUS_MAX_ITERATIONS}) reached, exiting monitoring")
             exit_reason = f"Max iterations ({config.STATUS_MAX_ITERATIONS}) reached"
 
         with self._lock:
             if self._stop_monitoring:
-                print(f"    Monitoring stopped by S key")
+                self._log(f"    Monitoring stopped by S key")
                 exit_reason = "Monitoring stopped by S key"
                 self._stop_monitoring = False  # Reset flag
 
         # Send telegram message when returning to idle state (except for S key stop)
         if exit_reason and exit_reason != "Monitoring stopped by S key":
-            try:
-                message = f"Returning to IDLE state.\nReason: {exit_reason}"
-                asyncio.run(send_message(message))
-                print(f"    Telegram message sent: Returning to idle")
-            except Exception as telegram_error:
-                print(f"    Failed to send Telegram message: {telegram_error}")
+            message = f"Returning to IDLE state.\nReason: {exit_reason}"
+            self._send_telegram(message, "Returning to idle")
 
-        print(f"    Returning to idle state - waiting for human Alt press...")
+        self._log(f"    Returning to idle state - waiting for human Alt press...")
 
     def _execute_qe_sequence(self):
         """Execute the Q/E capture sequence (positions 1, 2, 3)"""
-        print(" Starting Q/E capture sequence...")
+        self._log(" Starting Q/E capture sequence...")
+
+        # Pick up window moves/resizes once per sequence, not on every grab
+        self._refresh_capture_geometry()
 
         # Initial delay for UI to appear
-        print(f"   ⏱️ Waiting {self._initial_delay}s for UI to appear...")
+        self._log(f"   ⏱️ Waiting {self._initial_delay}s for UI to appear...")
         time.sleep(self._initial_delay)
 
-        # Process each position sequentially
         success_count = 0
         positions = list(self._crop_coords.keys())
 
-        for position in positions:
-            print(f"    Processing position {position}...")
-            if self._capture_classify_and_send(position):
-                success_count += 1
+        if self._fused_capture:
+            # One-shot wait, then every position is cut from the same grab
+            if self._capture_delays:
+                delay_min, delay_max = self._capture_delays[0]
+                random_delay = self._rng.uniform(delay_min, delay_max)
+                self._log(f"    Capture delay for glyph strip: {random_delay:.3f}s")
+                time.sleep(random_delay)
+
+            # ESC during the capture delay - don't grab or classify the strip
+            strip = self._grab_strip() if self._running else None
+            if strip is None:
+                if self._running:
+                    # Every position depends on this grab, so all of them count as failed
+                    self._log(f"    Failed to capture glyph strip - {len(positions)} positions not processed")
             else:
-                print(f"   ⚠️ Position {position} processing failed")
+                # All tiles are known up front, so they are scored in one batched match
+                tiles = [strip[self._strip_slices[position]] for position in positions]
+                classified = self._classify_tiles(tiles)
+
+                for position, tile, result in zip(positions, tiles, classified):
+                    if self._classify_and_send(position, tile, result):
+                        success_count += 1
+                    else:
+                        self._log(f"   ⚠️ Position {position} processing failed")
+        else:
+            # Process each position sequentially
+            for position in positions:
+                # ESC mid-sequence - don't capture/classify the remaining positions
+                if not self._running:
+                    break
+                if self._capture_classify_and_send(position):
+                    success_count += 1
+                else:
+                    self._log(f"   ⚠️ Position {position} processing failed")
+
+        # PM check and status monitoring must see the result of the last key press
+        self._wait_for_esp_commands()
 
-        print(f" Q/E sequence completed! ({success_count}/{len(positions)} positions processed)")
+        self._log(f" Q/E sequence completed! ({success_count}/{len(positions)} positions processed)")
 
     def _check_pm_status(self) -> bool:
         """Check for PM status after Q/E sequence using template matching. Returns True if PM detected."""
-        print(f"\n Checking PM status...")
+        self._log(f"\n Checking PM status...")
 
         # Small delay before PM check
         time.sleep(0.3)
 
-        # Capture screenshot
-        frame = self._safe_grab()
-        if frame is None:
-            print(f"    Failed to capture frame for PM check")
-            return False
-
-        # Crop to PM search region (larger area to search within)
-        pm_search_region = self._crop_pm_region(frame)
+        # Capture just the PM search region (larger area to search within)
+        pm_search_region = self._grab_region("pm")
         if pm_search_region is None:
-            print(f"    Failed to crop PM search region")
+            self._log(f"    Failed to capture PM search region")
             return False
 
         try:
             # Convert to grayscale for template matching
-            gray_region = cv2.cvtColor(pm_search_region, cv2.COLOR_BGR2GRAY)
+            gray_region = cv2.cvtColor(pm_search_region, cv2.COLOR_BGRA2GRAY)
 
-            # Load PM template
-            import os
-            pm_template_path = os.path.join(config.STATUS_TEMPLATES_PM, "pm_1920.png")
-            if not os.path.exists(pm_template_path):
-                print(f"    PM template not found: {pm_template_path}")
-                return False
-
-            pm_template = cv2.imread(pm_template_path, cv2.IMREAD_GRAYSCALE)
-            if pm_template is None:
-                print(f"    Failed to load PM template")
+            # PM template is loaded once at startup
+            if self._pm_template is None:
+                self._log(f"    PM template not available - skipping PM check")
                 return False
 
             # Perform template matching
-            result = cv2.matchTemplate(gray_region, pm_template, cv2.TM_CCOEFF_NORMED)
+            if self._pm_template_umat is not None:
+                result = cv2.matchTemplate(cv2.UMat(gray_region), self._pm_template_umat, cv2.TM_CCOEFF_NORMED)
+            else:
+                result = cv2.matchTemplate(gray_region, self._pm_template, cv2.TM_CCOEFF_NORMED)
             _, max_val, _, max_loc = cv2.minMaxLoc(result)
 
-            print(f"    PM template match confidence: {max_val:.3f}")
+            self._log(f"    PM template match confidence: {max_val:.3f}")
 
             # Check if PM detected with sufficient confidence
             pm_threshold = config.STATUS_CONFIDENCE_THRESHOLDS.get('pm', config.STATUS_CONFIDENCE_THRESHOLD)
             if max_val >= pm_threshold:
-                print(f"    PM detected at location {max_loc}! Confidence: {max_val:.3f}")
+                self._log(f"    PM detected at location {max_loc}! Confidence: {max_val:.3f}")
 
                 # Send telegram message
-                try:
-                    message = f"PM detected! Confidence: {max_val:.3f}\nReturning to idle state."
-                    asyncio.run(send_message(message))
-                    print(f"    Telegram message sent: PM detected")
-                except Exception as telegram_error:
-                    print(f"    Failed to send Telegram message: {telegram_error}")
+                message = f"PM detected! Confidence: {max_val:.3f}\nReturning to idle state."
+                self._send_telegram(message, "PM detected")
 
                 return True
             else:
-                print(f"    No PM detected (confidence too low: {max_val:.3f})")
+                self._log(f"    No PM detected (confidence too low: {max_val:.3f})")
                 return False
 
         except Exception as e:
-            print(f"    PM detection error: {e}")
+            self._log(f"    PM detection error: {e}")
             import traceback
-            traceback.print_exc()
+            self._log(traceback.format_exc())
             return False
 
     def _execute_sequence(self):
         """Execute the full 3-position capture sequence followed by status monitoring"""
-        with self._lock:
-            if self._processing_sequence:
-                print(" Sequence already in progress, ignoring Alt press")
-                return
-            self._processing_sequence = True
-            # Reset stop monitoring flag for new sequence
-            self._stop_monitoring = False
-
         try:
             # Execute Q/E sequence
             self._execute_qe_sequence()
 
+            # ESC during the Q/E sequence - skip the PM check and status monitoring
+            if not self._running:
+                return
+
             # Check for PM status after Q/E sequence
             pm_detected = self._check_pm_status()
 
@@ -566,31 +940,95 @@ class AltTriggeredAutomation:
                 # Start status monitoring loop
                 self._status_monitoring_loop()
             else:
-                print(f" PM detected - skipping status monitoring, returning to idle")
+                self._log(f" PM detected - skipping status monitoring, returning to idle")
 
         except Exception as e:
-            print(f" Sequence error: {e}")
+            self._log(f" Sequence error: {e}")
         finally:
             with self._lock:
                 self._processing_sequence = False
 
+    def _sequence_worker_loop(self) -> None:
+        """Long-lived worker: run one sequence each time an Alt press sets the event"""
+        self._tune_sequence_thread()
+        while True:
+            self._sequence_event.wait()
+            self._sequence_event.clear()
+            if not self._running:
+                return
+            self._execute_sequence()
+
+    def _tune_sequence_thread(self) -> None:
+        """Apply the optional Windows priority/affinity settings to the calling thread"""
+        above_normal = config.SEQUENCE_THREAD_ABOVE_NORMAL
+        affinity_mask = config.SEQUENCE_THREAD_AFFINITY_MASK
+        if sys.platform != "win32" or not (above_normal or affinity_mask):
+            return
+
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.GetCurrentThread.restype = wintypes.HANDLE
+        kernel32.SetThreadAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+        kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+        kernel32.SetThreadPriority.argtypes = [wintypes.HANDLE, ctypes.c_int]
+        thread = kernel32.GetCurrentThread()
+
+        if affinity_mask:
+            if kernel32.SetThreadAffinityMask(thread, affinity_mask):
+                self._log(f" Sequence thread pinned to CPU mask {affinity_mask:#x}")
+            else:
+                self._log(f"⚠️ SetThreadAffinityMask failed (error {ctypes.get_last_error()})")
+
+        if above_normal:
+            THREAD_PRIORITY_ABOVE_NORMAL = 1
+            if kernel32.SetThreadPriority(thread, THREAD_PRIORITY_ABOVE_NORMAL):
+                self._log(" Sequence thread priority: above normal")
+            else:
+                self._log(f"⚠️ SetThreadPriority failed (error {ctypes.get_last_error()})")
+
+    def _raise_process_priority(self) -> None:
+        """Move the process to HIGH_PRIORITY_CLASS when PROCESS_HIGH_PRIORITY is set (Windows only)"""
+        if sys.platform != "win32" or not config.PROCESS_HIGH_PRIORITY:
+            return
+
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        kernel32.SetPriorityClass.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+
+        HIGH_PRIORITY_CLASS = 0x00000080
+        if kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), HIGH_PRIORITY_CLASS):
+            self._log(" Process priority class: high")
+        else:
+            self._log(f"⚠️ SetPriorityClass failed (error {ctypes.get_last_error()})")
+
     def _handle_alt_press(self):
         """Handle Alt key press - trigger the full sequence"""
-        now = time.perf_counter()
+        now_ns = time.perf_counter_ns()
 
-        # Debounce check with thread safety
+        # Debounce check and sequence claim with thread safety
         with self._lock:
-            if (now - self._last_alt_press) < self._debounce_s:
+            if (now_ns - self._last_alt_press_ns) < self._debounce_ns:
+                return
+            self._last_alt_press_ns = now_ns
+
+            if self._processing_sequence:
+                self._log(" Sequence already in progress, ignoring Alt press")
                 return
-            self._last_alt_press = now
+            self._processing_sequence = True
+            # Reset stop monitoring flag for new sequence
+            self._stop_monitoring = False
 
-        print(f"\n Alt pressed! Triggering capture sequence...")
+        self._log(f"\n Alt pressed! Triggering capture sequence...")
 
-        # Run sequence in a separate thread to avoid blocking key listener
-        sequence_thread = threading.Thread(target=self._execute_sequence, daemon=True)
-        sequence_thread.start()
+        # Wake the sequence worker - the key listener never blocks on the sequence
+        self._sequence_event.set()
 
-    def on_press(self, key) -> None:
+    def on_press(self, key) -> Optional[bool]:
         """Handle key press events"""
         try:
             # Listen for Alt, S, and ESC keys
@@ -598,17 +1036,17 @@ class AltTriggeredAutomation:
                 self._handle_alt_press()
             elif hasattr(key, 'char') and key.char and key.char.lower() == 's':
                 # S key pressed - immediately stop monitoring and return to idle
-                print("\n S key pressed - stopping monitoring and returning to idle...")
+                self._log("\n S key pressed - stopping monitoring and returning to idle...")
                 with self._lock:
                     self._stop_monitoring = True
-                print(" Ready for next Alt press...")
+                self._log(" Ready for next Alt press...")
             elif key == keyboard.Key.esc:
-                print("\n ESC detected; exiting Alt-triggered automation...")
+                self._log("\n ESC detected; exiting Alt-triggered automation...")
                 self._running = False
-                raise StopIteration
+                return False  # Stops the pynput listener
 
         except Exception as exc:
-            print(f" Keypress error: {exc}")
+            self._log(f" Keypress error: {exc}")
         return None
 
     def run(self) -> None:
@@ -639,6 +1077,7 @@ class AltTriggeredAutomation:
         print(f"   - Min confidence: {config.MIN_CONFIDENCE_FOR_ESP_ACTION}")
         print(f"   - Initial delay: {self._initial_delay}s")
         print(f"   - Capture delays: {self._capture_delays}")
+        print(f"   - Fused capture: {self._fused_capture}")
         print()
         print(" Status Monitoring Settings:")
         print(f"   - End region: ({config.END_REGION_CROP['x']}, {config.END_REGION_CROP['y']}) "
@@ -657,26 +1096,46 @@ class AltTriggeredAutomation:
         print("=" * 70)
         print(" Ready! Press Alt to start...")
 
+        self._raise_process_priority()
+
         try:
             with keyboard.Listener(on_press=self.on_press) as listener:
-                while self._running:
-                    time.sleep(0.1)
-                listener.stop()
+                # Block until ESC stops the listener; the join timeout only keeps
+                # Ctrl+C deliverable on Windows, there is no state polling
+                while listener.is_alive():
+                    listener.join(1.0)
         except KeyboardInterrupt:
             print("\n Interrupted by user")
         finally:
+            # Wake the sequence worker so it sees _running == False and exits
+            self._running = False
+            self._sequence_event.set()
+
             # Clean up resources
+            self._esp_q.put(None)
+            self._esp_thread.join(timeout=5.0)
             self.keyboard.cleanup()
+            self._stop_image_writer()
+            if self._csv_file is not None:
+                self._csv_file.close()
+            self._stop_telegram()
 
             # Close all thread-local mss instances
             with self._sct_lock:
-                for sct_instance in self._sct_instances.values():
+                for sct_instance in self._sct_instances:
                     try:
                         sct_instance.close()
                     except:
                         pass
                 self._sct_instances.clear()
 
+            if self._dxcam is not None:
+                try:
+                    self._dxcam.release()
+                except Exception:
+                    pass
+
+            self._stop_console_writer()
             print(" Alt-triggered automation stopped")
 
 
@@ -708,12 +1167,23 @@ def main():
                     help=f"Delay after Alt press (default: {config.INITIAL_DELAY}s)")
     ap.add_argument("--capture-delay", type=float, default=None,
                     help="Delay between captures (overrides config)")
+    ap.add_argument("--fused-capture", action="store_true",
+                    help="Capture all glyph positions in a single grab (default: config FUSED_GLYPH_CAPTURE)")
+    ap.add_argument("--save-crops", action="store_true",
+                    help=f"Save cropped glyph images for debugging (default: {config.SAVE_CROPPED_IMAGES})")
     ap.add_argument("--esp-delay-range", nargs=2, type=int, default=None, 
                     metavar=("MIN", "MAX"),
                     help=f"Random delay range in ms (default: {config.ESP_DELAY_MIN} {config.ESP_DELAY_MAX})")
+    ap.add_argument("--rng-seed", type=int, default=None,
+                    help="Seed the timing RNG for reproducible delays (profiling/replay only)")
 
     args = ap.parse_args()
 
+    if args.save_crops:
+        config.SAVE_CROPPED_IMAGES = True
+    if args.fused_capture:
+        config.FUSED_GLYPH_CAPTURE = True
+
     # Validate ESP delay range if provided
     if args.esp_delay_range:
         if args.esp_delay_range[0] >= args.esp_delay_range[1]:
@@ -730,7 +1200,8 @@ def main():
             templates_path=args.templates_path,
             bring_foreground=not args.no_foreground if args.no_foreground else None,
             esp_port=args.esp_port,
-            esp_delay_range=tuple(args.esp_delay_range) if args.esp_delay_range else None
+            esp_delay_range=tuple(args.esp_delay_range) if args.esp_delay_range else None,
+            rng_seed=args.rng_seed
         )
 
         # Apply custom timing if specified
@@ -114,6 +114,12 @@ WINDOW_TITLE = "MTA: San Andreas"
 # Size of each crop (width x height in pixels)
 CROP_SIZE = 26
 
+# Backend for full-window grabs (status/end/PM monitoring):
+#   "mss"   - GDI BitBlt, works everywhere
+#   "dxcam" - DXGI Desktop Duplication (pip install dxcam, Windows only, window must be
+#             on the primary monitor). Falls back to mss if dxcam cannot be created.
+CAPTURE_BACKEND = "mss"
+
 # ============================================================================
 # TIMING SETTINGS
 # ============================================================================
@@ -129,6 +135,12 @@ CAPTURE_DELAYS = [
     (0.3, 0.6),  # Third capture: 0.6s (fixed)
 ]
 
+# Capture all 3 glyph positions in a single grab after the first capture delay.
+# The remaining CAPTURE_DELAYS are skipped; the ESP random delays are chained, so
+# each key press still follows the previous one by ESP_DELAY_MIN..ESP_DELAY_MAX ms.
+# Only enable if all glyphs are on screen together.
+FUSED_GLYPH_CAPTURE = False
+
 # Debounce time between Alt presses (seconds)
 ALT_DEBOUNCE_TIME = 0.5
 
@@ -142,7 +154,14 @@ ESP_DELAY_MAX = 200
 
 # ESP32 Serial Configuration
 ESP32_BAUDRATE = 115200
-ESP32_TIMEOUT = 1.0
+
+# Longest wait (seconds) for the ESP32's reply line after a command; the read
+# returns as soon as the newline arrives, this only bounds a silent board
+ESP32_RESPONSE_TIMEOUT = 0.05
+
+# Ask the serial driver not to coalesce small writes (Linux ASYNC_LOW_LATENCY).
+# Ignored where the driver or platform does not support it.
+ESP32_LOW_LATENCY = True
 
 # ESP32 port (None for auto-detection)
 ESP32_PORT = None  # e.g., "COM3" or None for auto-detect
@@ -163,6 +182,14 @@ HIGH_CONFIDENCE_THRESHOLD = 0.8
 # Template matching confidence threshold
 TEMPLATE_CONFIDENCE_THRESHOLD = 0.7
 
+# Score glyphs on N x N block-averaged masks (1 = full 26x26 resolution, 2 = 13x13).
+# Cuts template matching cost ~N^2; A/B against 1 before relying on it.
+GLYPH_MATCH_DOWNSAMPLE = 1
+
+# Remember results for this many distinct glyph tiles (pixel-identical tiles
+# skip classification and image saving). 0 disables the cache.
+GLYPH_RESULT_CACHE_SIZE = 128
+
 # ============================================================================
 # STATUS MONITORING (POST Q/E SEQUENCE)
 # ============================================================================
@@ -185,6 +212,10 @@ STATUS_CONFIDENCE_THRESHOLD = 0.8  # Default threshold for status detection (bac
 STATUS_MAX_RETRIES = 5             # Max retries before exiting on no match
 STATUS_MAX_ITERATIONS = 50         # Max loop iterations before forced exit
 
+# Run the PM template search through OpenCV's T-API (UMat/OpenCL, e.g. on an
+# integrated GPU). Only used if OpenCL is available; otherwise plain CPU matching.
+PM_MATCH_USE_OPENCL = False
+
 # Individual confidence thresholds for each status type
 STATUS_CONFIDENCE_THRESHOLDS = {
     'end': 0.9,   # End detection threshold
@@ -200,6 +231,20 @@ STATUS_CONFIDENCE_THRESHOLDS = {
 # Whether to bring MTA window to foreground on startup
 BRING_WINDOW_TO_FOREGROUND = True
 
+# ============================================================================
+# SCHEDULING (WINDOWS ONLY)
+# ============================================================================
+
+# Run the capture/classify sequence thread at THREAD_PRIORITY_ABOVE_NORMAL
+SEQUENCE_THREAD_ABOVE_NORMAL = False
+
+# Pin the sequence thread to these logical CPUs (bit mask, e.g. 0x1 = CPU 0), or None.
+# On Intel hybrid CPUs the low-numbered logical CPUs are usually P-cores.
+SEQUENCE_THREAD_AFFINITY_MASK = None
+
+# Run the whole automation process in HIGH_PRIORITY_CLASS (applies for the process lifetime)
+PROCESS_HIGH_PRIORITY = False
+
 # ============================================================================
 # LOGGING AND DEBUG
 # ============================================================================
@@ -210,6 +255,17 @@ VERBOSE_LOGGING = True
 # Save cropped images for debugging
 SAVE_CROPPED_IMAGES = False
 
+# File format for saved crops: "png" (lossless, usable as templates), "bmp" (lossless,
+# uncompressed - fastest to write) or "jpg" (lossy, small files)
+SAVED_IMAGE_FORMAT = "png"
+
+# PNG zlib level (0-9) when SAVED_IMAGE_FORMAT is "png" - 1 is far faster than OpenCV's
+# default 3 and barely larger for tiny glyph tiles
+SAVED_IMAGE_PNG_COMPRESSION = 1
+
+# JPEG quality (0-100) used when SAVED_IMAGE_FORMAT is "jpg"
+SAVED_IMAGE_JPEG_QUALITY = 85
+
 # Log classification details to CSV
 LOG_TO_CSV = True
 
@@ -227,6 +283,9 @@ def validate_config():
     
     if ESP_DELAY_MIN < 0 or ESP_DELAY_MAX < 0:
         errors.append("ESP delay values must be non-negative")
+
+    if ESP32_RESPONSE_TIMEOUT <= 0:
+        errors.append("ESP32_RESPONSE_TIMEOUT must be positive")
     
     # Validate crop size
     if CROP_SIZE <= 0:
@@ -257,6 +316,18 @@ def validate_config():
     if not (0 <= TEMPLATE_CONFIDENCE_THRESHOLD <= 1):
         errors.append("TEMPLATE_CONFIDENCE_THRESHOLD must be between 0 and 1")
 
+    if CAPTURE_BACKEND not in ("mss", "dxcam"):
+        errors.append("CAPTURE_BACKEND must be 'mss' or 'dxcam'")
+
+    if SEQUENCE_THREAD_AFFINITY_MASK is not None and SEQUENCE_THREAD_AFFINITY_MASK <= 0:
+        errors.append("SEQUENCE_THREAD_AFFINITY_MASK must be a positive bit mask or None")
+
+    if GLYPH_MATCH_DOWNSAMPLE < 1 or CROP_SIZE % GLYPH_MATCH_DOWNSAMPLE != 0:
+        errors.append("GLYPH_MATCH_DOWNSAMPLE must be a positive divisor of CROP_SIZE")
+
+    if GLYPH_RESULT_CACHE_SIZE < 0:
+        errors.append("GLYPH_RESULT_CACHE_SIZE must be non-negative")
+
     if not (0 <= STATUS_CONFIDENCE_THRESHOLD <= 1):
         errors.append("STATUS_CONFIDENCE_THRESHOLD must be between 0 and 1")
 
@@ -276,6 +347,16 @@ def validate_config():
     if STATUS_MAX_ITERATIONS < 1:
         errors.append("STATUS_MAX_ITERATIONS must be at least 1")
 
+    # Validate debug image saving
+    if SAVED_IMAGE_FORMAT not in ("png", "bmp", "jpg"):
+        errors.append("SAVED_IMAGE_FORMAT must be 'png', 'bmp' or 'jpg'")
+
+    if not (0 <= SAVED_IMAGE_PNG_COMPRESSION <= 9):
+        errors.append("SAVED_IMAGE_PNG_COMPRESSION must be between 0 and 9")
+
+    if not (0 <= SAVED_IMAGE_JPEG_QUALITY <= 100):
+        errors.append("SAVED_IMAGE_JPEG_QUALITY must be between 0 and 100")
+
     return errors
 
 # ============================================================================
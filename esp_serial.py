@@ -5,12 +5,19 @@ ESP32-S3 Serial Communication Module - Optimized
 import serial
 import serial.tools.list_ports
 import time
-from typing import Optional, List
+from typing import Callable, Optional, List
 import config
 
 class ESP32Serial:
-    def __init__(self, port: Optional[str] = None):
+    def __init__(self, port: Optional[str] = None, log: Callable[[str], None] = print):
+        """
+        Args:
+            port: COM port (None = config.ESP32_PORT / auto-detect)
+            log: Console output sink; callers on latency-sensitive threads pass a
+                 non-blocking (queued) logger so a stalled console can't delay a send
+        """
         self.port = port or config.ESP32_PORT
+        self._log = log
         self.connection: Optional[serial.Serial] = None
         self.is_connected = False
     
@@ -39,25 +46,40 @@ class ESP32Serial:
             self.connection = serial.Serial(
                 port, 
                 config.ESP32_BAUDRATE, 
-                timeout=config.ESP32_TIMEOUT
+                timeout=config.ESP32_RESPONSE_TIMEOUT
             )
             self.port = port
             self.is_connected = True
+            if config.ESP32_LOW_LATENCY:
+                self._enable_low_latency()
             time.sleep(2)  # ESP32 initialization delay
             if config.VERBOSE_LOGGING:
-                print(f"✅ Connected to ESP32 on {port}")
+                self._log(f"✅ Connected to ESP32 on {port}")
             return True
         except Exception as e:
             if config.VERBOSE_LOGGING:
-                print(f"❌ Failed to connect to {port}: {e}")
+                self._log(f"❌ Failed to connect to {port}: {e}")
             self.is_connected = False
             return False
     
+    def _enable_low_latency(self):
+        """Disable driver-side buffering of small writes where supported"""
+        # Only the POSIX backend exposes this; on Windows the FTDI latency
+        # timer lives in the driver settings and cannot be set from pyserial.
+        set_low_latency = getattr(self.connection, "set_low_latency_mode", None)
+        if set_low_latency is None:
+            return
+        try:
+            set_low_latency(True)
+        except (IOError, ValueError) as e:
+            if config.VERBOSE_LOGGING:
+                self._log(f"⚠️ Low-latency serial mode unavailable on {self.port}: {e}")
+
     def send_command(self, command: str, retries: int = 3) -> bool:
         """Send command to ESP32 with retry logic"""
         if not self.is_connected or not self.connection:
             if config.VERBOSE_LOGGING:
-                print("❌ ESP32 not connected")
+                self._log("❌ ESP32 not connected")
             return False
 
         for attempt in range(retries):
@@ -65,22 +87,20 @@ class ESP32Serial:
                 self.connection.write(f"{command}\n".encode())
                 self.connection.flush()
 
-                # Reduced response wait time for speed
-                time.sleep(0.05)  # Reduced from 0.1 to 0.05
-                if self.connection.in_waiting > 0:
-                    response = self.connection.readline().decode().strip()
-                    if config.VERBOSE_LOGGING:
-                        print(f"ESP32: {response}")
+                # Returns as soon as the reply line is in, or empty after ESP32_RESPONSE_TIMEOUT
+                response = self.connection.read_until(b"\n").decode().strip()
+                if response and config.VERBOSE_LOGGING:
+                    self._log(f"ESP32: {response}")
 
                 return True
             except Exception as e:
                 if attempt < retries - 1:
                     if config.VERBOSE_LOGGING:
-                        print(f"⚠️ Error sending command '{command}' (attempt {attempt+1}/{retries}): {e}")
+                        self._log(f"⚠️ Error sending command '{command}' (attempt {attempt+1}/{retries}): {e}")
                     time.sleep(0.1)  # Brief delay before retry
                 else:
                     if config.VERBOSE_LOGGING:
-                        print(f"❌ Failed to send command '{command}' after {retries} attempts: {e}")
+                        self._log(f"❌ Failed to send command '{command}' after {retries} attempts: {e}")
                     return False
 
         return False
@@ -91,4 +111,4 @@ class ESP32Serial:
             self.connection.close()
             self.is_connected = False
             if config.VERBOSE_LOGGING:
-                print("👋 ESP32 disconnected")
\ No newline at end of file
+                self._log("👋 ESP32 disconnected")
\ No newline at end of file
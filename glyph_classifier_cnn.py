@@ -42,49 +42,32 @@ class SimpleCNN:
         return exp_x / np.sum(exp_x)
     
     def conv2d(self, input_data: np.ndarray, weights: np.ndarray, bias: np.ndarray, stride: int = 1) -> np.ndarray:
-        """Simple 2D convolution"""
+        """2D convolution as im2col + a single matrix product"""
         if len(input_data.shape) == 2:
             input_data = input_data.reshape(1, input_data.shape[0], input_data.shape[1])
-        
-        in_channels, in_height, in_width = input_data.shape
+
+        in_channels = input_data.shape[0]
         out_channels = weights.shape[0]
         kernel_size = weights.shape[-1]
-        
-        out_height = (in_height - kernel_size) // stride + 1
-        out_width = (in_width - kernel_size) // stride + 1
-        
-        output = np.zeros((out_channels, out_height, out_width))
-        
-        for oc in range(out_channels):
-            for ic in range(in_channels):
-                for h in range(out_height):
-                    for w in range(out_width):
-                        h_start = h * stride
-                        w_start = w * stride
-                        patch = input_data[ic, h_start:h_start+kernel_size, w_start:w_start+kernel_size]
-                        if len(weights.shape) == 3:  # First layer
-                            output[oc, h, w] += np.sum(patch * weights[oc])
-                        else:  # Subsequent layers
-                            output[oc, h, w] += np.sum(patch * weights[oc, ic])
-            output[oc] += bias[oc]
-        
-        return output
+
+        # (in_channels, out_h, out_w, k, k) windows -> (in_channels*k*k, out_h*out_w) columns
+        windows = np.lib.stride_tricks.sliding_window_view(input_data, (kernel_size, kernel_size), axis=(1, 2))
+        windows = windows[:, ::stride, ::stride]
+        out_height, out_width = windows.shape[1], windows.shape[2]
+        cols = windows.transpose(0, 3, 4, 1, 2).reshape(in_channels * kernel_size * kernel_size, -1)
+
+        # First-layer (out, k, k) and later (out, in, k, k) weights flatten to the same row layout
+        output = weights.reshape(out_channels, -1) @ cols
+        return output.reshape(out_channels, out_height, out_width) + bias[:, None, None]
     
     def maxpool2d(self, input_data: np.ndarray, pool_size: int = 2) -> np.ndarray:
-        """Simple max pooling"""
+        """Max pooling as one reshape + reduce (trailing rows/cols that don't fill a window are dropped)"""
         channels, height, width = input_data.shape
         new_height = height // pool_size
         new_width = width // pool_size
-        
-        output = np.zeros((channels, new_height, new_width))
-        
-        for c in range(channels):
-            for h in range(new_height):
-                for w in range(new_width):
-                    patch = input_data[c, h*pool_size:(h+1)*pool_size, w*pool_size:(w+1)*pool_size]
-                    output[c, h, w] = np.max(patch)
-        
-        return output
+
+        trimmed = input_data[:, :new_height * pool_size, :new_width * pool_size]
+        return trimmed.reshape(channels, new_height, pool_size, new_width, pool_size).max(axis=(2, 4))
     
     def forward(self, x: np.ndarray) -> np.ndarray:
         """Forward pass"""
@@ -133,6 +116,9 @@ class CNNGlyphClassifier:
             
         images = []
         labels = []
+        # Noisy copies are generated for all originals at once after the loop
+        originals = []
+        noisy_slots = []
         
         for class_idx, glyph in enumerate(self.class_names):
             glyph_path = os.path.join(self.templates_path, glyph)
@@ -152,15 +138,21 @@ class CNNGlyphClassifier:
                         images.append(np.array(rotated))
                         labels.append(class_idx)
                     
-                    # Add noise
-                    noisy = self.add_noise(img_array)
-                    images.append(noisy)
+                    # Add noise (slot filled in below)
+                    originals.append(img_array)
+                    noisy_slots.append(len(images))
+                    images.append(None)
                     labels.append(class_idx)
         
+        # One noise draw and clip for the whole (N, 26, 26) stack
+        if originals:
+            for slot, noisy in zip(noisy_slots, self.add_noise(np.stack(originals))):
+                images[slot] = noisy
+        
         return np.array(images), np.array(labels)
     
     def add_noise(self, image: np.ndarray, noise_level: float = 0.1) -> np.ndarray:
-        """Add gaussian noise to image"""
+        """Add gaussian noise to an image or a stack of images"""
         noise = np.random.normal(0, noise_level * 255, image.shape)
         noisy_image = image + noise
         return np.clip(noisy_image, 0, 255).astype(np.uint8)
@@ -3,7 +3,7 @@ from PIL import Image, ImageFilter
 import numpy as np
 import os
 import pickle
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 from config import (
     TEMPLATES_PATH,
     TEMPLATE_CONFIDENCE_THRESHOLD,
@@ -12,15 +12,19 @@ from config import (
 
 
 class TemplateGlyphClassifier:
-    def __init__(self, templates_path: str, rotations: Optional[List[int]] = None):
+    def __init__(self, templates_path: str, rotations: Optional[List[int]] = None,
+                 match_downsample: int = 1):
         """
         Initialize classifier with template images from templates_path/q/ and templates_path/e/
+        match_downsample: score on masks block-averaged by this factor (1 = full resolution)
         """
         self.templates: Dict[str, List[np.ndarray]] = {"q": [], "e": []}
         self.rotations = rotations if rotations is not None else [0, -15, 15, -30, 30, -45, 45]
         self.templates_path = templates_path
-        # Cache for template statistics to avoid recomputation
-        self._template_stats: Dict[str, List[Tuple[np.ndarray, float, float]]] = {"q": [], "e": []}
+        self.match_downsample = match_downsample
+        # Packed (N, H*W) float32 template matrices, keyed by template size
+        self._template_matrix: Dict[int, np.ndarray] = {}
+        self._class_rows: Dict[str, Tuple[int, slice]] = {}
         self.load_templates()
 
     def load_templates(self):
@@ -46,24 +50,95 @@ class TemplateGlyphClassifier:
                         else:
                             rotated = img
                         
+                        # Preprocessed templates are binary - keep them as uint8 masks
                         processed = self.preprocess_image(rotated)
-                        self.templates[glyph].append(processed)
-
-                        # Pre-compute template statistics for faster correlation
-                        flat = processed.flatten()
-                        mean = np.mean(flat)
-                        centered = flat - mean
-                        norm = np.sqrt(np.dot(centered, centered))
-                        self._template_stats[glyph].append((centered, mean, norm))
-
+                        self.templates[glyph].append(processed.astype(np.uint8))
                         template_count += 1
 
             print(f"Loaded {template_count} templates for '{glyph}'")
 
-    def preprocess_image(self, image: Image.Image) -> np.ndarray:
+        self._pack_templates()
+
+    def _pack_templates(self):
+        """Stack templates into contiguous zero-mean, unit-norm float32 matrices.
+
+        Classes whose templates have the same size share one matrix, so they are all
+        scored with a single matrix-vector product; _class_rows maps each class to
+        its (template size, row range) in that matrix.
+        """
+        grouped: Dict[int, List[np.ndarray]] = {}
+        self._class_rows = {}
+        for name, templates in self.templates.items():
+            if not templates:
+                continue
+            vectors = [self._match_vector(t) for t in templates]
+            length = vectors[0].size
+            rows = grouped.setdefault(length, [])
+            start = len(rows)
+            rows.extend(vectors)
+            self._class_rows[name] = (length, slice(start, len(rows)))
+
+        self._template_matrix = {}
+        for length, rows in grouped.items():
+            stack = np.stack(rows).astype(np.float32)
+            stack -= stack.mean(axis=1, keepdims=True)
+            norms = np.linalg.norm(stack, axis=1, keepdims=True)
+            # Flat templates are all zeros after centering and keep a score of 0
+            np.divide(stack, norms, out=stack, where=norms > 0)
+            self._template_matrix[length] = np.ascontiguousarray(stack)
+
+    def _match_vector(self, mask: np.ndarray) -> np.ndarray:
+        """Flatten a preprocessed mask for matching, block-averaged by match_downsample"""
+        f = self.match_downsample
+        h, w = mask.shape
+        if f > 1 and h % f == 0 and w % f == 0:
+            mask = mask.reshape(h // f, f, w // f, f).mean(axis=(1, 3), dtype=np.float32)
+        return mask.ravel()
+
+    def _match_scores(self, processed_image: np.ndarray, classes: List[str]) -> Dict[str, float]:
+        """Best normalized cross correlation per class (one matrix-vector product per template size)"""
+        img_centered = self._match_vector(processed_image).astype(np.float32)
+        img_centered -= img_centered.mean()
+        img_norm = float(np.linalg.norm(img_centered))
+
+        correlations: Dict[int, np.ndarray] = {}
+        scores: Dict[str, float] = {}
+        for name in classes:
+            if img_norm == 0 or name not in self._class_rows:
+                scores[name] = 0.0
+                continue
+            length, rows = self._class_rows[name]
+            if length not in correlations:
+                correlations[length] = self._template_matrix[length] @ img_centered
+            best = float(correlations[length][rows].max()) / img_norm
+            scores[name] = max(0.0, best)
+        return scores
+
+    def _match_scores_batch(self, processed_images: List[np.ndarray], classes: List[str]) -> List[Dict[str, float]]:
+        """_match_scores for several images (one matrix-matrix product per template size)"""
+        imgs_centered = np.stack([self._match_vector(p) for p in processed_images]).astype(np.float32)
+        imgs_centered -= imgs_centered.mean(axis=1, keepdims=True)
+        img_norms = np.linalg.norm(imgs_centered, axis=1).astype(np.float64)
+
+        correlations: Dict[int, np.ndarray] = {}
+        best: Dict[str, np.ndarray] = {}
+        for name in classes:
+            if name not in self._class_rows:
+                best[name] = np.zeros(len(processed_images))
+                continue
+            length, rows = self._class_rows[name]
+            if length not in correlations:
+                correlations[length] = self._template_matrix[length] @ imgs_centered.T
+            # Flat inputs (zero norm) score 0, as in _match_scores
+            best[name] = np.divide(correlations[length][rows].max(axis=0), img_norms,
+                                   out=np.zeros_like(img_norms), where=img_norms > 0)
+        return [{name: max(0.0, float(best[name][i])) for name in classes}
+                for i in range(len(processed_images))]
+
+    def preprocess_image(self, image: Union[Image.Image, np.ndarray]) -> np.ndarray:
         """Enhanced preprocessing for noise reduction"""
-        # Convert to numpy
-        img_array = np.array(image)
+        # Convert to numpy (no copy if already an array)
+        img_array = np.asarray(image)
         
         # Gaussian blur to reduce noise
         img_pil = Image.fromarray(img_array).filter(ImageFilter.GaussianBlur(radius=0.8))
@@ -79,150 +154,124 @@ class TemplateGlyphClassifier:
         return binary.astype(np.float32) / 255.0
 
     def calculate_otsu_threshold(self, image: np.ndarray) -> int:
-        """Calculate optimal threshold using Otsu's method"""
-        histogram = np.bincount(image.flatten(), minlength=256)
+        """Calculate optimal threshold using Otsu's method (all 256 candidates at once)"""
+        histogram = np.bincount(image.ravel(), minlength=256)
         total_pixels = image.size
-        
-        sum_total = np.dot(np.arange(256), histogram)
-        sum_background = 0
-        weight_background = 0
-        maximum_variance = 0
-        optimal_threshold = 0
-        
-        for threshold in range(256):
-            weight_background += histogram[threshold]
-            if weight_background == 0:
-                continue
-                
-            weight_foreground = total_pixels - weight_background
-            if weight_foreground == 0:
-                break
-                
-            sum_background += threshold * histogram[threshold]
-            mean_background = sum_background / weight_background
-            mean_foreground = (sum_total - sum_background) / weight_foreground
-            
-            variance_between = weight_background * weight_foreground * \
-                             (mean_background - mean_foreground) ** 2
-            
-            if variance_between > maximum_variance:
-                maximum_variance = variance_between
-                optimal_threshold = threshold
-                
-        return optimal_threshold
 
-    def morphological_clean(self, binary_image: np.ndarray) -> np.ndarray:
-        """Simple morphological operations without OpenCV"""
-        # Basic erosion followed by dilation (opening operation)
-        kernel = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]], dtype=np.uint8)
-        
-        # Erosion
-        eroded = np.zeros_like(binary_image)
-        for i in range(1, binary_image.shape[0] - 1):
-            for j in range(1, binary_image.shape[1] - 1):
-                region = binary_image[i-1:i+2, j-1:j+2]
-                if np.all(region * kernel == kernel * 255):
-                    eroded[i, j] = 255
-        
-        # Dilation
-        dilated = np.zeros_like(eroded)
-        for i in range(1, eroded.shape[0] - 1):
-            for j in range(1, eroded.shape[1] - 1):
-                region = eroded[i-1:i+2, j-1:j+2]
-                if np.any(region * kernel > 0):
-                    dilated[i, j] = 255
-                    
-        return dilated
+        # Background weight/sum for every candidate threshold
+        weight_background = np.cumsum(histogram)
+        weight_foreground = total_pixels - weight_background
+        sum_background = np.cumsum(np.arange(256) * histogram)
+        sum_total = sum_background[-1]
 
-    def normalized_cross_correlation(self, image: np.ndarray, template: np.ndarray) -> float:
-        """Calculate normalized cross correlation between image and template - optimized"""
-        if image.shape != template.shape:
-            return 0.0
+        # Thresholds with an empty class are skipped, as in the per-threshold scan
+        valid = (weight_background > 0) & (weight_foreground > 0)
+        if not valid.any():
+            return 0
 
-        # Vectorized operations for better performance
-        img_flat = image.flatten()
-        temp_flat = template.flatten()
+        wb = weight_background[valid]
+        wf = weight_foreground[valid]
+        sb = sum_background[valid]
+        variance_between = wb * wf * (sb / wb - (sum_total - sb) / wf) ** 2
 
-        # Pre-compute means
-        img_mean = np.mean(img_flat)
-        temp_mean = np.mean(temp_flat)
+        # First maximum wins; no positive variance keeps the default threshold of 0
+        best = int(np.argmax(variance_between))
+        if variance_between[best] <= 0:
+            return 0
+        return int(np.flatnonzero(valid)[best])
 
-        # Mean-zero arrays
-        img_centered = img_flat - img_mean
-        temp_centered = temp_flat - temp_mean
-
-        # Vectorized correlation calculation
-        numerator = np.dot(img_centered, temp_centered)
-        denominator = np.sqrt(np.dot(img_centered, img_centered) * np.dot(temp_centered, temp_centered))
+    def morphological_clean(self, binary_image: np.ndarray) -> np.ndarray:
+        """Simple morphological operations without OpenCV"""
+        # Basic erosion followed by dilation (opening operation) with a 3x3 cross,
+        # computed on shifted slices; the 1-pixel border stays 0 as before
+        fg = binary_image == 255
+        center = (slice(1, -1), slice(1, -1))
+        up, down = (slice(None, -2), slice(1, -1)), (slice(2, None), slice(1, -1))
+        left, right = (slice(1, -1), slice(None, -2)), (slice(1, -1), slice(2, None))
 
-        if denominator == 0:
-            return 0.0
+        # Erosion
+        eroded = np.zeros(fg.shape, dtype=bool)
+        eroded[center] = fg[center] & fg[up] & fg[down] & fg[left] & fg[right]
 
-        return numerator / denominator
+        # Dilation
+        dilated = np.zeros_like(binary_image)
+        dilated[center][eroded[center] | eroded[up] | eroded[down] | eroded[left] | eroded[right]] = 255
 
-    def fast_correlation(self, img_centered: np.ndarray, img_norm: float,
-                        temp_centered: np.ndarray, temp_norm: float) -> float:
-        """Fast correlation using pre-computed centered values and norms"""
-        if img_norm == 0 or temp_norm == 0:
-            return 0.0
+        return dilated
 
-        numerator = np.dot(img_centered, temp_centered)
-        denominator = img_norm * temp_norm
+    def _normalize_input(self, image: Union[Image.Image, np.ndarray],
+                         target_size: Tuple[int, int] = (26, 26)) -> Union[Image.Image, np.ndarray]:
+        """
+        Bring an input to a grayscale image of target_size (width, height)
+        uint8 arrays that already have that size pass through untouched
+        """
+        # Arrays of any other shape/format go through the PIL resize/convert path
+        if isinstance(image, np.ndarray) and (image.shape != target_size[::-1] or image.dtype != np.uint8):
+            image = Image.fromarray(image)
 
-        return numerator / denominator
+        # Ensure proper size and format
+        if isinstance(image, Image.Image):
+            if image.size != target_size:
+                image = image.resize(target_size, Image.Resampling.LANCZOS)
+            if image.mode != 'L':
+                image = image.convert('L')
+        return image
 
-    def classify(self, image: Image.Image) -> Tuple[str, float, Dict[str, float]]:
+    def classify(self, image: Union[Image.Image, np.ndarray]) -> Tuple[str, float, Dict[str, float]]:
         """
         Classify a single 26x26 glyph image
+        Accepts a PIL image or a 26x26 uint8 grayscale array (used as-is, no PIL round-trip)
         Returns: (predicted_class, confidence, all_scores)
         """
-        # Ensure proper size and format
-        if image.size != (26, 26):
-            image = image.resize((26, 26), Image.Resampling.LANCZOS)
-        if image.mode != 'L':
-            image = image.convert('L')
-            
         # Preprocess input image
-        processed_image = self.preprocess_image(image)
+        processed_image = self.preprocess_image(self._normalize_input(image))
 
-        # Pre-compute image statistics once
-        img_flat = processed_image.flatten()
-        img_mean = np.mean(img_flat)
-        img_centered = img_flat - img_mean
-        img_norm = np.sqrt(np.dot(img_centered, img_centered))
+        # Match against all templates at once
+        scores = self._match_scores(processed_image, ["q", "e"])
 
-        # Match against all templates using optimized correlation
-        scores: Dict[str, float] = {}
-        for glyph in ["q", "e"]:
-            max_correlation = 0.0
-            for temp_centered, temp_mean, temp_norm in self._template_stats[glyph]:
-                correlation = self.fast_correlation(img_centered, img_norm, temp_centered, temp_norm)
-                max_correlation = max(max_correlation, correlation)
-            scores[glyph] = max_correlation
-        
         # Determine best match - Fixed the max function call
         predicted_glyph = max(scores.keys(), key=lambda k: scores[k])
         confidence = scores[predicted_glyph]
         
         return predicted_glyph, confidence, scores
 
-    def classify_batch(self, images: List[Image.Image]) -> List[Tuple[str, float]]:
-        """Classify multiple images at once"""
+    def classify_many(self, images: List[Union[Image.Image, np.ndarray]]) -> List[Tuple[str, float, Dict[str, float]]]:
+        """
+        classify() for several glyph images, scored with one matrix-matrix product
+        Returns: [(predicted_class, confidence, all_scores), ...] in input order
+        """
+        if not images:
+            return []
+
+        processed = [self.preprocess_image(self._normalize_input(img)) for img in images]
+
         results = []
-        for img in images:
-            glyph, confidence, _ = self.classify(img)
-            results.append((glyph, confidence))
+        for scores in self._match_scores_batch(processed, ["q", "e"]):
+            predicted_glyph = max(scores.keys(), key=lambda k: scores[k])
+            results.append((predicted_glyph, scores[predicted_glyph], scores))
         return results
 
+    def classify_batch(self, images: List[Image.Image]) -> List[Tuple[str, float]]:
+        """Classify multiple images at once"""
+        return [(glyph, confidence) for glyph, confidence, _ in self.classify_many(images)]
+
     def save_model(self, filepath: str):
-        """Save preprocessed templates to disk"""
-        with open(filepath, 'wb') as f:
-            pickle.dump(self.templates, f)
+        """Save preprocessed templates to disk (.npz, one (N, H, W) uint8 mask stack per class)"""
+        stacks = {name: np.stack(templates) if templates else np.empty((0, 0, 0), dtype=np.uint8)
+                  for name, templates in self.templates.items()}
+        np.savez(filepath, **stacks)
 
     def load_model(self, filepath: str):
-        """Load preprocessed templates from disk"""
-        with open(filepath, 'rb') as f:
-            self.templates = pickle.load(f)
+        """Load preprocessed templates from disk (.npz, or a legacy pickled dict for .pkl paths)"""
+        if filepath.endswith(".pkl"):
+            with open(filepath, 'rb') as f:
+                self.templates = pickle.load(f)
+        else:
+            with np.load(filepath, allow_pickle=False) as stacks:
+                self.templates = {name: list(stacks[name]) for name in stacks.files}
+
+        # Scoring uses the packed matrices, so they must follow the loaded templates
+        self._pack_templates()
 
 
 if __name__ == "__main__":
@@ -249,5 +298,5 @@ if __name__ == "__main__":
     print(f"All scores: q={all_scores['q']:.4f}, e={all_scores['e']:.4f}")
     
     # Save model for faster future loading
-    classifier.save_model("glyph_templates.pkl")
-    print("Templates saved to glyph_templates.pkl")
+    classifier.save_model("glyph_templates.npz")
+    print("Templates saved to glyph_templates.npz")
@@ -4,43 +4,45 @@ High-Level Keyboard Interface using centralized config
 
 from esp_serial import ESP32Serial
 from config import ESP32_PORT
-from typing import Optional
+from typing import Callable, Optional
 
 class KeyboardInterface:
-    def __init__(self, esp_port: Optional[str] = None):
+    def __init__(self, esp_port: Optional[str] = None, log: Callable[[str], None] = print):
         # Use centralized config if no specific port provided
         port = esp_port or ESP32_PORT
-        self.esp32 = ESP32Serial(port=port)
+        # All console output (here and in ESP32Serial) goes through log
+        self._log = log
+        self.esp32 = ESP32Serial(port=port, log=log)
         self.connected = False
 
     def initialize(self) -> bool:
         if self.esp32.auto_connect():
             self.connected = True
-            print("🎮 Keyboard interface ready")
+            self._log("🎮 Keyboard interface ready")
             return True
         else:
-            print("❌ Failed to initialize keyboard interface")
+            self._log("❌ Failed to initialize keyboard interface")
             return False
 
     def press_alt(self) -> bool:
         if not self.connected:
-            print("❌ Keyboard not connected")
+            self._log("❌ Keyboard not connected")
             return False
-        print("⌨️  Pressing Alt key...")
+        self._log("⌨️  Pressing Alt key...")
         return self.esp32.send_command("ALT")
 
     def press_e(self) -> bool:
         if not self.connected:
-            print("❌ Keyboard not connected") 
+            self._log("❌ Keyboard not connected") 
             return False
-        print("⌨️  Pressing E key...")
+        self._log("⌨️  Pressing E key...")
         return self.esp32.send_command("E")
 
     def press_q(self) -> bool:
         if not self.connected:
-            print("❌ Keyboard not connected")
+            self._log("❌ Keyboard not connected")
             return False
-        print("⌨️  Pressing Q key...")
+        self._log("⌨️  Pressing Q key...")
         return self.esp32.send_command("Q")
 
     def press_character_key(self, character: str) -> bool:
@@ -49,7 +51,7 @@ class KeyboardInterface:
         elif character == 'Q':
             return self.press_q()
         else:
-            print(f"❌ Invalid character: {character}")
+            self._log(f"❌ Invalid character: {character}")
             return False
 
     def cleanup(self):
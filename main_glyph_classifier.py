@@ -1,17 +1,23 @@
 # main_glyph_classifier.py - Template-only version
 from PIL import Image
+import numpy as np
 import os
 import sys
 from glyph_classifier_template import TemplateGlyphClassifier
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, List, Optional, Union
 import csv
 from datetime import datetime
 from config import (
     TEMPLATES_PATH,
     MIN_CONFIDENCE_FOR_ESP_ACTION,
-    TEMPLATE_CONFIDENCE_THRESHOLD
+    TEMPLATE_CONFIDENCE_THRESHOLD,
+    GLYPH_MATCH_DOWNSAMPLE
 )
 
+# Column order of the results CSV written by GlyphClassifier.log_result
+CSV_FIELDNAMES = ('timestamp', 'image_path', 'prediction', 'confidence',
+                  'method_used', 'template_confidence')
+
 
 class GlyphClassifier:
     def __init__(self, templates_path: str, confidence_threshold: float = 0.7):
@@ -20,7 +26,7 @@ class GlyphClassifier:
 
         # Initialize template classifier
         print("Initializing template classifier...")
-        self.template_classifier = TemplateGlyphClassifier(templates_path)
+        self.template_classifier = TemplateGlyphClassifier(templates_path, match_downsample=GLYPH_MATCH_DOWNSAMPLE)
 
         # Try to load pre-trained model
         self.load_model()
@@ -28,21 +34,36 @@ class GlyphClassifier:
     def load_model(self):
         """Load pre-trained template model if available"""
         try:
-            if os.path.exists("glyph_templates.pkl"):
-                self.template_classifier.load_model("glyph_templates.pkl")
-                print("Loaded pre-trained template model")
+            # .pkl is the legacy pickled format, still read if no .npz has been saved
+            for model_path in ("glyph_templates.npz", "glyph_templates.pkl"):
+                if os.path.exists(model_path):
+                    self.template_classifier.load_model(model_path)
+                    print("Loaded pre-trained template model")
+                    break
         except Exception as e:
             print(f"Could not load template model: {e}")
 
-    def classify(self, image: Image.Image) -> Tuple[str, float, Dict]:
+    def classify(self, image: Union[Image.Image, np.ndarray]) -> Tuple[str, float, Dict]:
         """
         Classify glyph using template matching
+        Accepts a PIL image or a grayscale uint8 array
         Returns: (predicted_class, confidence, detailed_results)
         """
-        results: Dict = {}
-
         # Template matching
         template_pred, template_conf, template_scores = self.template_classifier.classify(image)
+        return template_pred, template_conf, self._build_details(template_pred, template_conf, template_scores)
+
+    def classify_batch(self, images: List[Union[Image.Image, np.ndarray]]) -> List[Tuple[str, float, Dict]]:
+        """
+        Classify several glyphs with one batched template match
+        Returns: [(predicted_class, confidence, detailed_results), ...] in input order
+        """
+        return [(pred, conf, self._build_details(pred, conf, scores))
+                for pred, conf, scores in self.template_classifier.classify_many(images)]
+
+    def _build_details(self, template_pred: str, template_conf: float, template_scores: Dict) -> Dict:
+        """Detailed results dict returned alongside each classification"""
+        results: Dict = {}
         results['template'] = {
             'prediction': template_pred,
             'confidence': template_conf,
@@ -55,8 +76,16 @@ class GlyphClassifier:
             'confidence': template_conf
         }
 
-        return template_pred, template_conf, results
+        return results
     
+    def warmup(self, size: int = 26):
+        """Run one throwaway classification so first-use costs are paid at startup"""
+        # Quadrant checkerboard: a flat tile would make _match_scores skip the template product
+        tile = ((np.indices((size, size)) // max(1, size // 2)).sum(axis=0) % 2 * 255).astype(np.uint8)
+        mask = self.template_classifier.preprocess_image(tile)
+        assert mask.min() != mask.max(), "warmup tile is flat after preprocessing"
+        self.classify(tile)
+
     def classify_from_file(self, image_path: str) -> Tuple[str, float, Dict]:
         """Classify glyph from image file"""
         image = Image.open(image_path)
@@ -68,25 +97,26 @@ class GlyphClassifier:
         file_exists = os.path.exists(csv_path)
 
         with open(csv_path, 'a', newline='') as csvfile:
-            fieldnames = ['timestamp', 'image_path', 'prediction', 'confidence',
-                         'method_used', 'template_confidence']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            # Plain csv.writer with rows in CSV_FIELDNAMES order (no per-row dict mapping)
+            writer = csv.writer(csvfile)
 
             if not file_exists:
-                writer.writeheader()
-
-            template_conf = details.get('template', {}).get('confidence', 0)
-
-            row = {
-                'timestamp': datetime.now().isoformat(),
-                'image_path': image_path,
-                'prediction': prediction,
-                'confidence': f"{confidence:.4f}",
-                'method_used': details.get('method_used', 'unknown'),
-                'template_confidence': f"{template_conf:.4f}"
-            }
-
-            writer.writerow(row)
+                writer.writerow(CSV_FIELDNAMES)
+
+            writer.writerow(self.csv_row(image_path, prediction, confidence, details))
+
+    def csv_row(self, image_path: str, prediction: str, confidence: float, details: Dict) -> Tuple:
+        """One results CSV row, in CSV_FIELDNAMES order (for callers that keep the CSV open)"""
+        template_conf = details.get('template', {}).get('confidence', 0)
+
+        return (
+            datetime.now().isoformat(),
+            image_path,
+            prediction,
+            f"{confidence:.4f}",
+            details.get('method_used', 'unknown'),
+            f"{template_conf:.4f}"
+        )
 
 
 def main():
@@ -2,7 +2,7 @@
 from PIL import Image
 import os
 import numpy as np
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, Optional, Union
 from glyph_classifier_template import TemplateGlyphClassifier
 from config import (
     STATUS_TEMPLATES_END,
@@ -92,35 +92,18 @@ class StatusClassifier:
             print(f"Failed to load status templates: {e}")
             raise
 
-    def classify(self, image: Image.Image, region_type: str = "status") -> Tuple[str, float, Dict]:
+    def classify(self, image: Union[Image.Image, np.ndarray], region_type: str = "status") -> Tuple[str, float, Dict]:
         """
         Classify status image as 'end', 'alt', 'wait', 'pm', or neither
 
         Args:
-            image: Input image to classify
+            image: Input image to classify (PIL image or grayscale uint8 array of the region size)
             region_type: "end" for end region, "status" for alt/wait region, "pm" for pm region
 
         Returns:
             (prediction, confidence, details)
         """
-        # Ensure proper image format based on region type
-        if region_type == "end":
-            expected_height = END_REGION_CROP['height']
-            expected_width = END_REGION_CROP['width']
-        elif region_type == "pm":
-            expected_height = PM_REGION_CROP['height']
-            expected_width = PM_REGION_CROP['width']
-        else:
-            expected_height = STATUS_REGION_CROP['height']
-            expected_width = STATUS_REGION_CROP['width']
-
-        if image.size != (expected_width, expected_height):
-            image = image.resize((expected_width, expected_height), Image.Resampling.LANCZOS)
-
-        if image.mode != 'L':
-            image = image.convert('L')
-
-        # Use template classifier
+        # Size/format normalization happens once, in the template classifier
         prediction, confidence, scores = self.template_classifier.classify(image, region_type=region_type)
 
         details = {
@@ -134,7 +117,7 @@ class StatusClassifier:
 
         return prediction, confidence, details
 
-    def classify_from_crop(self, cropped_image: Image.Image, region_type: str = "status") -> Tuple[str, float, Dict]:
+    def classify_from_crop(self, cropped_image: Union[Image.Image, np.ndarray], region_type: str = "status") -> Tuple[str, float, Dict]:
         """Classify from already cropped region"""
         return self.classify(cropped_image, region_type=region_type)
 
@@ -151,7 +134,9 @@ class StatusTemplateClassifier(TemplateGlyphClassifier):
         self.templates = {"end": [], "alt": [], "wait": [], "pm": []}
         self.rotations = rotations if rotations is not None else [0, -15, 15, -30, 30, -45, 45]
         self.templates_path = templates_path
-        self._template_stats = {"end": [], "alt": [], "wait": [], "pm": []}
+        self.match_downsample = 1
+        self._template_matrix = {}
+        self._class_rows = {}
         self.load_templates()
 
     def load_templates(self):
@@ -186,30 +171,24 @@ class StatusTemplateClassifier(TemplateGlyphClassifier):
                         else:
                             rotated = img
 
+                        # Preprocessed templates are binary - keep them as uint8 masks
                         processed = self.preprocess_image(rotated)
-                        self.templates[status].append(processed)
-
-                        # Pre-compute template statistics for faster correlation
-                        flat = processed.flatten()
-                        mean = np.mean(flat)
-                        centered = flat - mean
-                        norm = np.sqrt(np.dot(centered, centered))
-                        self._template_stats[status].append((centered, mean, norm))
-
+                        self.templates[status].append(processed.astype(np.uint8))
                         template_count += 1
 
             print(f"Loaded {template_count} templates for '{status}'")
 
-    def classify(self, image: Image.Image, region_type: str = "status") -> Tuple[str, float, Dict[str, float]]:
+        self._pack_templates()
+
+    def classify(self, image: Union[Image.Image, np.ndarray], region_type: str = "status") -> Tuple[str, float, Dict[str, float]]:
         """
         Classify a status region image
         Args:
-            image: Input image to classify
+            image: Input image to classify (PIL image, or grayscale uint8 array used as-is
+                   when it already has the region size)
             region_type: "end" for end region, "status" for alt/wait region, "pm" for pm region
         Returns: (predicted_class, confidence, all_scores)
         """
-        import numpy as np
-        from config import STATUS_REGION_CROP, END_REGION_CROP, PM_REGION_CROP
 
         # Ensure proper size and format based on region type
         if region_type == "end":
@@ -222,28 +201,11 @@ class StatusTemplateClassifier(TemplateGlyphClassifier):
             target_size = (STATUS_REGION_CROP['width'], STATUS_REGION_CROP['height'])
             status_list = ["alt", "wait"]
 
-        if image.size != target_size:
-            image = image.resize(target_size, Image.Resampling.LANCZOS)
-        if image.mode != 'L':
-            image = image.convert('L')
-
-        # Preprocess input image
-        processed_image = self.preprocess_image(image)
-
-        # Pre-compute image statistics once
-        img_flat = processed_image.flatten()
-        img_mean = np.mean(img_flat)
-        img_centered = img_flat - img_mean
-        img_norm = np.sqrt(np.dot(img_centered, img_centered))
-
-        # Match against all templates using optimized correlation
-        scores: Dict[str, float] = {}
-        for status in status_list:
-            max_correlation = 0.0
-            for temp_centered, temp_mean, temp_norm in self._template_stats[status]:
-                correlation = self.fast_correlation(img_centered, img_norm, temp_centered, temp_norm)
-                max_correlation = max(max_correlation, correlation)
-            scores[status] = max_correlation
+        # Preprocess input image (same size/format handling as the glyph classifier)
+        processed_image = self.preprocess_image(self._normalize_input(image, target_size))
+
+        # Match against all templates at once
+        scores = self._match_scores(processed_image, status_list)
 
         # Determine best match
         predicted_status = max(scores.keys(), key=lambda k: scores[k])
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
 Window discovery and client-area bbox computation for MTA: San Andreas.
-Exports: WindowInfo, find_window, ensure_foreground, get_capture_bbox
+Exports: WindowInfo, find_window, ensure_foreground, refresh_client_bbox, get_capture_bbox
 """
 
 from __future__ import annotations
@@ -19,7 +19,7 @@ except ImportError as e:
 
 from ctypes import windll, byref, wintypes
 
-__all__ = ["WindowInfo", "find_window", "ensure_foreground", "get_capture_bbox"]
+__all__ = ["WindowInfo", "find_window", "ensure_foreground", "refresh_client_bbox", "get_capture_bbox"]
 
 @dataclass
 class WindowInfo:
@@ -125,6 +125,17 @@ def ensure_foreground(hwnd: int, retries: int = 5, sleep_s: float = 0.05) -> boo
         return False
     return False
 
+def refresh_client_bbox(info: WindowInfo) -> Tuple[int, int, int, int]:
+    """
+    Re-query the window's current client-area bbox and store it in info.client_bbox.
+    The previous value is kept (and returned) if the window can no longer be queried.
+    """
+    try:
+        info.client_bbox = _get_client_rect_screen(info.hwnd)
+    except Exception:
+        pass
+    return info.client_bbox
+
 def get_capture_bbox(info: WindowInfo) -> Tuple[int, int, int, int]:
     """
     Return the client-area bbox in screen coordinates (left, top, width, height).